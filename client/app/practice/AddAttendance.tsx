@@ -44,7 +44,7 @@ export default function AddAttendance({ practiceId, onDone }: Props) {
       // ======================
       try {
         const usersRes = await fetch(
-          `${process.env.NEXT_PUBLIC_API_URL}/users`,
+          `${process.env.NEXT_PUBLIC_API_URL}/users?fields=first_name,last_name,email,username`,
           {
             method: "GET",
             headers: authHeadersNoContent(),
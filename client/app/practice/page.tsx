@@ -1,7 +1,17 @@
 "use client";
 
 import { Calendar, dateFnsLocalizer } from "react-big-calendar";
-import { format, parse, startOfWeek, getDay } from "date-fns";
+import {
+  addDays,
+  endOfMonth,
+  endOfWeek,
+  format,
+  getDay,
+  max,
+  parse,
+  startOfMonth,
+  startOfWeek,
+} from "date-fns";
 import { enUS } from "date-fns/locale";
 import "react-big-calendar/lib/css/react-big-calendar.css";
 
@@ -37,8 +47,16 @@ export default function Practice() {
 
   const { user } = useUserAuthentication();
 
+  // Only fetch the range the calendar can show: the month grid, or the
+  // 30 days the agenda view lists
+  const from = format(startOfWeek(startOfMonth(date)), "yyyy-MM-dd");
+  const to = format(
+    max([endOfWeek(endOfMonth(date)), addDays(date, 30)]),
+    "yyyy-MM-dd"
+  );
+
   useEffect(() => {
-    fetch(`${process.env.NEXT_PUBLIC_API_URL}/practice-sessions`, {
+    fetch(`${process.env.NEXT_PUBLIC_API_URL}/practice-sessions?from=${from}&to=${to}`, {
       method: "GET",
       headers: authHeadersNoContent(),
     })
@@ -47,7 +65,7 @@ export default function Practice() {
       .catch((err) =>
         console.error("Failed to fetch practice sessions:", err)
       );
-  }, []);
+  }, [from, to]);
 
   const calendarEvents: CalendarEvent[] = sessions
     .map((session) => {
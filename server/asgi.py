@@ -0,0 +1,283 @@
+"""ASGI entry point: async handlers for the hot read endpoints, Flask for the rest.
+
+GET routes below run on the asyncio data-access layer (async_queries/) so one
+process can keep many I/O-bound requests in flight. Every other request falls
+through to the existing Flask app, so the URL surface is identical to main.py.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+    gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+"""
+
+from contextlib import asynccontextmanager
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+
+from async_db import close_async_pools, get_async_db
+from async_queries.attendance_queries import get_attendances_by_user
+from async_queries.event_queries import (
+    get_event_by_id,
+    get_events_after,
+    get_events_paginated,
+    get_events_version,
+    get_total_events,
+)
+from async_queries.link_queries import get_links_by_category
+from async_queries.practice_queries import (
+    get_all_practice_sessions,
+    get_practice_sessions_after,
+    get_practice_sessions_json,
+    get_practice_sessions_version,
+)
+from async_queries.user_queries import get_me, get_user_by_id
+from auth import verify_token
+from json_provider import DB_JSON_RESPONSES, RawJSON
+from main import CORS_ORIGINS
+from main import app as flask_app
+from routes.event_routes import MAX_EVENTS_PAGE, includes, next_event_cursor, parse_event_cursor
+from routes.practice_routes import (
+    MAX_PRACTICE_PAGE,
+    next_practice_cursor,
+    parse_practice_cursor,
+    parse_practice_range,
+)
+from utils import APIError, body_etag, parse_quantity, version_etag
+
+
+# ── Response helpers ──────────────────────────────────────────────────────────
+
+
+def _json(body, status):
+    # Encode with the Flask app's JSON provider so both entry points format
+    # payloads (datetimes included) the same way
+    return Response(flask_app.json.dumps(body), status, media_type="application/json")
+
+
+def _etag_matches(request, etag):
+    # Weak comparison, as werkzeug does for If-None-Match on the Flask side
+    header = request.headers.get("if-none-match", "")
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _conditional(request, response, etag):
+    if _etag_matches(request, etag):
+        response = Response(status_code=304)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(request, etag):
+    """A 304 for a version ETag the client already has, else None."""
+    etag = f'W/"{etag}"'
+    if not _etag_matches(request, etag):
+        return None
+    return _conditional(request, Response(status_code=304), etag)
+
+
+def success_response(data, status=200, request=None, etag=None):
+    """Same envelope and ETag/304 handling as utils.success_response()."""
+    response = _json({"success": True, "data": data, "error": None}, status)
+    if status != 200 or request is None:
+        return response
+    if etag is not None:
+        return _conditional(request, response, f'W/"{etag}"')
+    return _conditional(request, response, f'"{body_etag(response.body)}"')
+
+
+def request_etag(request, version):
+    return version_etag(f"{request.url.path}?{request.url.query}", version)
+
+
+async def handle_api_error(request, err):
+    return _json(
+        {"success": False, "data": None, "error": {"code": err.code, "message": err.message}},
+        err.status,
+    )
+
+
+def require_user_id(request):
+    auth_header = request.headers.get("Authorization")
+
+    if not auth_header or not auth_header.startswith("Bearer "):
+        raise APIError("UNAUTHORIZED", "Not logged in", 401)
+
+    user_id = verify_token(auth_header.split(" ")[1])
+    if not user_id:
+        raise APIError("UNAUTHORIZED", "Invalid token", 401)
+    return user_id
+
+
+# ── Handlers ──────────────────────────────────────────────────────────────────
+
+
+async def get_events_by_cursor(request, cur, etag):
+    quantity = parse_quantity(request.query_params.get("quantity", 10), MAX_EVENTS_PAGE)
+    sort = request.query_params.get("sort", "id")
+    after = parse_event_cursor(request.query_params.get("after"), sort)
+    min_capacity = request.query_params.get("min_capacity")
+    search = request.query_params.get("search_term")
+    include_total = request.query_params.get("include_total") == "true"
+    approximate_total = request.query_params.get("approximate_total") == "true"
+    include_attendance = includes(request.query_params.get("include"), "attendance")
+
+    events, has_more = await get_events_after(
+        cur, quantity, sort, after, min_capacity, search, include_attendance
+    )
+    if include_total:
+        total, total_is_estimate = await get_total_events(
+            cur, search, min_capacity, approximate_total
+        )
+
+    data = {
+        "quantity": quantity,
+        "count": len(events),
+        "events": events,
+        "next_cursor": next_event_cursor(events, has_more, sort),
+    }
+    if include_total:
+        data["total"] = total
+        data["total_is_estimate"] = total_is_estimate
+    return success_response(data, 200, request, etag)
+
+
+async def get_events(request):
+    async with get_async_db(readonly=True) as (conn, cur):
+        etag = request_etag(request, await get_events_version(cur))
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+
+        if request.query_params.get("after") is not None:
+            return await get_events_by_cursor(request, cur, etag)
+        return await get_events_by_page(request, cur, etag)
+
+
+async def get_events_by_page(request, cur, etag):
+    page = int(request.query_params.get("page", 1))
+    quantity = int(request.query_params.get("quantity", 10))
+    offset = (page - 1) * quantity
+    min_capacity = request.query_params.get("min_capacity")
+    search = request.query_params.get("search_term")
+    approximate_total = request.query_params.get("approximate_total") == "true"
+    include_attendance = includes(request.query_params.get("include"), "attendance")
+
+    events, total, total_is_estimate = await get_events_paginated(
+        cur, quantity, offset, min_capacity, search, approximate_total, include_attendance
+    )
+
+    return success_response(
+        {
+            "page": page,
+            "quantity": quantity,
+            "count": len(events),
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "events": events,
+        },
+        200,
+        request,
+        etag,
+    )
+
+
+async def get_event(request):
+    event_id = request.path_params["event_id"]
+    async with get_async_db(readonly=True) as (conn, cur):
+        event = await get_event_by_id(cur, event_id)
+    if event is None:
+        raise APIError("EVENT_NOT_FOUND", f"Event {event_id} does not exist", 404)
+    return success_response(event.model_dump(), 200, request)
+
+
+async def get_links(request):
+    category = request.query_params.get("category")
+    async with get_async_db(readonly=True) as (conn, cur):
+        data = await get_links_by_category(cur, category)
+    return success_response(data, 200, request)
+
+
+async def user_get(request):
+    target_user_id = request.path_params["target_user_id"]
+    async with get_async_db(readonly=True) as (conn, cur):
+        user = await get_user_by_id(cur, target_user_id)
+    if user is None:
+        raise APIError("USER_NOT_FOUND", f"User {target_user_id} does not exist", 404)
+    return success_response(user.model_dump(), 200, request)
+
+
+async def get_current_user(request):
+    user_id = require_user_id(request)
+    async with get_async_db() as (conn, cur):
+        user = await get_me(cur, user_id)
+    return success_response(user.model_dump(), 200, request)
+
+
+async def my_attendance(request):
+    user_id = require_user_id(request)
+    async with get_async_db() as (conn, cur):
+        attendances = await get_attendances_by_user(cur, user_id)
+    return success_response(attendances, 200, request)
+
+
+async def get_practices(request):
+    require_user_id(request)
+    params = request.query_params
+    start, end = parse_practice_range(params.get("from"), params.get("to"))
+    async with get_async_db(readonly=True) as (conn, cur):
+        etag = request_etag(request, [*await get_practice_sessions_version(cur), start])
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+        if "after" in params:
+            quantity = parse_quantity(params.get("quantity", 50), MAX_PRACTICE_PAGE)
+            after = parse_practice_cursor(params.get("after"))
+            sessions, has_more = await get_practice_sessions_after(cur, quantity, after, start, end)
+            data = {
+                "quantity": quantity,
+                "count": len(sessions),
+                "sessions": sessions,
+                "next_cursor": next_practice_cursor(sessions, has_more),
+            }
+        elif DB_JSON_RESPONSES:
+            data = RawJSON(await get_practice_sessions_json(cur, start, end))
+        else:
+            data = await get_all_practice_sessions(cur, start, end)
+    return success_response(data, 200, request, etag)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    await close_async_pools()
+
+
+app = Starlette(
+    routes=[
+        Route("/events", get_events, methods=["GET"]),
+        Route("/events/{event_id:int}", get_event, methods=["GET"]),
+        Route("/links", get_links, methods=["GET"]),
+        Route("/users/{target_user_id:int}", user_get, methods=["GET"]),
+        Route("/auth/me", get_current_user, methods=["GET"]),
+        Route("/attendances/me", my_attendance, methods=["GET"]),
+        Route("/practice-sessions", get_practices, methods=["GET"]),
+        # Writes and everything else are served by the Flask app
+        Mount("/", app=WSGIMiddleware(flask_app)),
+    ],
+    middleware=[
+        Middleware(
+            CORSMiddleware,
+            allow_origins=CORS_ORIGINS,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+    ],
+    exception_handlers={APIError: handle_api_error},
+    lifespan=lifespan,
+)
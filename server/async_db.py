@@ -0,0 +1,139 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import psycopg
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+import db
+from db import (
+    _REPLICA_LAG_SQL,
+    POOL_MAX,
+    POOL_MIN,
+    POOL_TIMEOUT,
+    REPLICA_MAX_LAG,
+    _connection_kwargs,
+    _mark_replica,
+    _replica_check_due,
+)
+from utils import APIError
+
+# psycopg 3 prepares a statement server-side after it has run this many times
+# on a connection, so the async layer gets the same win as prepared.py.
+PREPARE_THRESHOLD = 2
+
+_pools = {}
+_pools_lock = asyncio.Lock()
+_replica_check_lock = asyncio.Lock()
+
+
+def _pool_args(name):
+    if name == "replica":
+        return {"conninfo": db.REPLICA_DATABASE_URL}
+    connect_kwargs = _connection_kwargs()
+    if "dsn" in connect_kwargs:
+        return {"conninfo": connect_kwargs["dsn"]}
+    return {"conninfo": "", "kwargs": {k: v for k, v in connect_kwargs.items() if v is not None}}
+
+
+async def _configure(conn):
+    conn.prepare_threshold = PREPARE_THRESHOLD
+
+
+async def get_async_pool(name="primary"):
+    pool = _pools.get(name)
+    if pool is None:
+        async with _pools_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                args = _pool_args(name)
+                kwargs = {**args.pop("kwargs", {}), "keepalives": 1, "keepalives_idle": 30}
+                pool = AsyncConnectionPool(
+                    **args,
+                    kwargs=kwargs,
+                    min_size=POOL_MIN,
+                    max_size=POOL_MAX,
+                    timeout=POOL_TIMEOUT,
+                    configure=_configure,
+                    open=False,
+                )
+                await pool.open()
+                _pools[name] = pool
+    return pool
+
+
+async def close_async_pools():
+    pools = list(_pools.values())
+    _pools.clear()
+    for pool in pools:
+        await pool.close()
+
+
+# Replica health and lag are shared with db.py, so sync and async reads agree
+# on when to skip the replica (DB_REPLICA_MAX_LAG / DB_REPLICA_CHECK_INTERVAL).
+
+
+async def _replica_lag_ok(conn):
+    # Only one task re-checks the lag; everyone else uses the last result
+    if not _replica_check_due() or _replica_check_lock.locked():
+        return db._replica["healthy"]
+    async with _replica_check_lock:
+        try:
+            async with conn.cursor() as cur:
+                await cur.execute(_REPLICA_LAG_SQL)
+                lag = float((await cur.fetchone())[0])
+            await conn.rollback()
+            _mark_replica(lag <= REPLICA_MAX_LAG, lag)
+        except psycopg.Error:
+            _mark_replica(False)
+    return db._replica["healthy"]
+
+
+async def _checkout_replica():
+    if not db._replica["healthy"] and not _replica_check_due():
+        return None
+
+    try:
+        pool = await get_async_pool("replica")
+        conn = await pool.getconn(timeout=1)
+    except (PoolTimeout, psycopg.OperationalError):
+        # The pool opens without connecting, so an unreachable replica only
+        # shows up as a timeout here; skip it until the next check
+        _mark_replica(False)
+        return None
+
+    if await _replica_lag_ok(conn):
+        return pool, conn
+    await pool.putconn(conn)
+    return None
+
+
+async def _checkout(readonly):
+    if readonly and db.REPLICA_DATABASE_URL:
+        checkout = await _checkout_replica()
+        if checkout is not None:
+            return checkout
+
+    pool = await get_async_pool()
+    try:
+        return pool, await pool.getconn()
+    except PoolTimeout:
+        raise APIError("DB_BUSY", "Server is busy, please try again", 503)
+
+
+@asynccontextmanager
+async def get_async_db(readonly=False):
+    """Async counterpart of utils.get_db(): yields (conn, cur) and commits on success."""
+    pool, conn = await _checkout(readonly)
+    try:
+        async with conn.cursor() as cur:
+            yield conn, cur
+        await conn.commit()
+    except Exception:
+        await conn.rollback()
+        raise
+    finally:
+        await pool.putconn(conn)
+
+
+def async_pool_stats():
+    return {name: pool.get_stats() for name, pool in _pools.items()}
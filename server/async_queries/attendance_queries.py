@@ -0,0 +1,9 @@
+from models import Attendance
+from prepared import statement_sql
+from rows import build_models
+from queries.attendance_queries import GET_ATTENDANCES_BY_USER
+
+
+async def get_attendances_by_user(db, user_id: int):
+    await db.execute(statement_sql(GET_ATTENDANCES_BY_USER), (user_id,))
+    return build_models(Attendance, db.description, await db.fetchall())
@@ -0,0 +1,62 @@
+from prepared import statement_sql
+from queries.event_queries import (
+    GET_EVENT_BY_ID,
+    GET_EVENTS_VERSION,
+    events_keyset_statement,
+    events_page_statement,
+    row_to_event,
+    row_to_listed_event,
+    total_events_statement,
+    uses_estimated_total,
+)
+
+
+async def get_event_by_id(db, event_id: int):
+    await db.execute(statement_sql(GET_EVENT_BY_ID), (event_id,))
+    row = await db.fetchone()
+    if row is None:
+        return None
+    return row_to_event(row)
+
+
+async def get_events_version(db):
+    await db.execute(statement_sql(GET_EVENTS_VERSION))
+    return await db.fetchone()
+
+
+async def get_events_paginated(
+    db, limit, offset, min_capacity=None, search=None, approximate_total=False, include_attendance=False
+):
+    name, params = events_page_statement(
+        limit, offset, min_capacity, search, approximate_total, include_attendance
+    )
+    await db.execute(statement_sql(name), params)
+    rows = await db.fetchall()
+    events = [row_to_listed_event(row[:-1], include_attendance) for row in rows]
+
+    if rows and rows[0][-1] is not None:
+        return events, rows[0][-1], uses_estimated_total(min_capacity, search, approximate_total)
+    if not rows and offset == 0:
+        return events, 0, False
+    total, _ = await get_total_events(db, search, min_capacity)
+    return events, total, False
+
+
+async def get_total_events(db, search=None, min_capacity=None, approximate_total=False):
+    name, params = total_events_statement(search, min_capacity, approximate_total)
+    await db.execute(statement_sql(name), params)
+    total = (await db.fetchone())[0]
+    if total is None:
+        return await get_total_events(db, search, min_capacity)
+    return total, uses_estimated_total(min_capacity, search, approximate_total)
+
+
+async def get_events_after(
+    db, limit, sort="id", after=None, min_capacity=None, search=None, include_attendance=False
+):
+    name, params = events_keyset_statement(
+        limit + 1, sort, after, min_capacity, search, include_attendance
+    )
+    await db.execute(statement_sql(name), params)
+    events = [row_to_listed_event(row, include_attendance) for row in await db.fetchall()]
+    return events[:limit], len(events) > limit
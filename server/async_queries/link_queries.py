@@ -0,0 +1,6 @@
+async def get_links_by_category(db, category):
+    await db.execute(
+        """SELECT id, link_url, title FROM links WHERE category = %s""", (category,)
+    )
+    data = await db.fetchall()
+    return [{"id": row[0], "link_url": row[1], "title": row[2]} for row in data]
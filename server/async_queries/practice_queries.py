@@ -0,0 +1,28 @@
+from models import PracticeSession
+from prepared import statement_sql
+from rows import build_models
+from queries.practice_queries import GET_PRACTICE_SESSIONS_VERSION, practice_sessions_statement
+
+
+async def get_practice_sessions_version(db):
+    await db.execute(statement_sql(GET_PRACTICE_SESSIONS_VERSION))
+    return await db.fetchone()
+
+
+async def get_practice_sessions_json(db, start=None, end=None):
+    name, params = practice_sessions_statement(start, end, as_json=True)
+    await db.execute(statement_sql(name), params)
+    return (await db.fetchone())[0]
+
+
+async def get_all_practice_sessions(db, start=None, end=None):
+    name, params = practice_sessions_statement(start, end)
+    await db.execute(statement_sql(name), params)
+    return build_models(PracticeSession, db.description, await db.fetchall())
+
+
+async def get_practice_sessions_after(db, limit, after=None, start=None, end=None):
+    name, params = practice_sessions_statement(start, end, after, limit + 1)
+    await db.execute(statement_sql(name), params)
+    sessions = build_models(PracticeSession, db.description, await db.fetchall())
+    return sessions[:limit], len(sessions) > limit
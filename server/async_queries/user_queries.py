@@ -0,0 +1,35 @@
+from models import UserBase, UserMe
+from prepared import statement_sql
+from queries.user_queries import GET_ME, GET_USER_BY_ID
+
+
+async def get_me(db, user_id: int):
+    await db.execute(statement_sql(GET_ME), (user_id,))
+    row = await db.fetchone()
+    if row is None:
+        return None
+
+    id, first_name, last_name, email, username, admin, user_type, availability = row
+
+    return UserMe(
+        id=id,
+        first_name=first_name,
+        last_name=last_name,
+        email=email,
+        username=username,
+        admin=admin,
+        type=user_type,
+        availability=availability,
+    )
+
+
+async def get_user_by_id(db, user_id: int):
+    await db.execute(statement_sql(GET_USER_BY_ID), (user_id,))
+    row = await db.fetchone()
+    if row is None:
+        return None
+
+    first_name, last_name, email, username = row
+    return UserBase(
+        first_name=first_name, last_name=last_name, email=email, username=username
+    )
@@ -1,16 +1,24 @@
 import jwt
 import datetime
 import os
+import time
 from dotenv import load_dotenv # type: ignore
+from flask import after_this_request, has_request_context
 
 load_dotenv()
 
 SECRET_KEY = os.getenv("SECRET_KEY")
 
-def create_token(user_id: int, remember_me: bool):
+# Seconds this process trusts a cached token version before re-reading it, i.e.
+# the longest a demotion made by another worker (or in SQL) can go unnoticed
+TOKEN_VERSION_TTL = float(os.getenv("TOKEN_VERSION_TTL", 30))
+
+def create_token(user_id: int, remember_me: bool, admin: bool = False, token_version: int = 0):
     days = 30 if remember_me else 1
     payload = {
         "user_id": user_id,
+        "admin": admin,
+        "ver": token_version,
         "exp": datetime.datetime.now() + datetime.timedelta(days=days)
     }
 
@@ -20,11 +28,48 @@ def create_token(user_id: int, remember_me: bool):
         token = token.decode("utf-8")
     return token
 
-def verify_token (token: str):
+def decode_token(token: str):
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        return payload["user_id"]
+        return jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
     except jwt.ExpiredSignatureError:
         return None
     except jwt.InvalidTokenError:
-        return None
\ No newline at end of file
+        return None
+
+def verify_token (token: str):
+    payload = decode_token(token)
+    return payload["user_id"] if payload else None
+
+
+# ── Token version cache ───────────────────────────────────────────────────────
+
+_token_versions = {}
+
+
+def cached_token_version(user_id: int):
+    entry = _token_versions.get(user_id)
+    if entry is None or entry[1] <= time.monotonic():
+        return None
+    return entry[0]
+
+
+def remember_token_version(user_id: int, version: int):
+    _token_versions[user_id] = (version, time.monotonic() + TOKEN_VERSION_TTL)
+
+
+def forget_token_version(user_id: int):
+    """Drop the cached version after a role/password change or deletion.
+
+    Inside a request this waits until the view has returned (and committed),
+    like cache.invalidate(), so a concurrent request cannot re-cache the old
+    version in between.
+    """
+    if not has_request_context():
+        _token_versions.pop(user_id, None)
+        return
+
+    @after_this_request
+    def forget_after_commit(response):
+        if response.status_code < 400:
+            _token_versions.pop(user_id, None)
+        return response
@@ -0,0 +1,80 @@
+"""Side-by-side load test of the WSGI app (main.py) and the ASGI app (asgi.py).
+
+Needs the benchmark extras: pip install -r requirements-bench.txt
+
+Start both servers against the same database, e.g.
+
+    gunicorn main:app --bind 127.0.0.1:5001 --workers 1 --threads 8
+    uvicorn asgi:app --port 5002 --workers 1
+
+then run
+
+    python -m benchmarks.asgi_vs_wsgi --wsgi http://127.0.0.1:5001 \\
+        --asgi http://127.0.0.1:5002 --concurrency 200 --requests 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+PATHS = ["/events?page=1&quantity=10", "/events?page=3&quantity=10&search_term=cafe", "/links?category=dance"]
+
+
+async def load(base_url, concurrency, requests):
+    timings = []
+    errors = 0
+    queue = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(PATHS[i % len(PATHS)])
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    res = await client.get(path)
+                    if res.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                timings.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50": timings[len(timings) // 2],
+        "p99": timings[int(len(timings) * 0.99) - 1],
+        "mean": statistics.mean(timings),
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wsgi", required=True)
+    parser.add_argument("--asgi", required=True)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    for label, url in (("wsgi", args.wsgi), ("asgi", args.asgi)):
+        await load(url, 10, 100)  # warm up pools
+        r = await load(url, args.concurrency, args.requests)
+        print(
+            f"{label}: {r['rps']:.0f} req/s  mean={r['mean']:.1f}ms  "
+            f"p50={r['p50']:.1f}ms  p99={r['p99']:.1f}ms  errors={r['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Row-by-row vs single-statement bulk updates for practice attendance and routines.
+
+Creates a throwaway practice session, users and routines inside a transaction
+that is rolled back at the end, so it is safe to point at a dev database.
+Usage:
+
+    python -m benchmarks.bulk_updates --sizes 10 100 1000 --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+
+from models import PracticeAttendanceUpdate, RoutineUpdate
+from queries.practice_queries import update_practice_attendance, update_routines_bulk
+from utils import get_db
+
+
+def update_attendance_per_row(db, practice_id, updates):
+    # The loop update_practice_attendance used to run
+    for record in updates:
+        db.execute(
+            "UPDATE practices SET attended = %s, late = %s, notes = %s WHERE id = %s;",
+            (record.attended, record.late, record.notes, record.id),
+        )
+
+
+def update_routines_per_row(db, routines):
+    for r in routines:
+        db.execute(
+            "UPDATE routines SET name = %s, notes = %s WHERE id = %s RETURNING id, name, notes;",
+            (r.name, r.notes, r.id),
+        )
+        db.fetchone()
+
+
+def seed(cur, size):
+    cur.execute(
+        "INSERT INTO practice_sessions (title, date) VALUES ('bench', now()) RETURNING id;"
+    )
+    practice_id = cur.fetchone()[0]
+    cur.execute(
+        """
+        WITH new_users AS (
+            INSERT INTO users (first_name, last_name, email, username, password)
+            SELECT 'Bench', 'User', 'bench-%s-' || g || '@example.com', 'bench-%s-' || g, 'x'
+            FROM generate_series(1, %s) g
+            RETURNING id
+        )
+        INSERT INTO practices (user_id, practice_session_id)
+        SELECT id, %s FROM new_users
+        RETURNING id;
+        """,
+        (practice_id, practice_id, size, practice_id),
+    )
+    practice_ids = [row[0] for row in cur.fetchall()]
+    cur.execute(
+        "INSERT INTO routines (name) SELECT 'routine ' || g FROM generate_series(1, %s) g RETURNING id;",
+        (size,),
+    )
+    routine_ids = [row[0] for row in cur.fetchall()]
+    return practice_id, practice_ids, routine_ids
+
+
+def timed(func, repeat):
+    timings = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with get_db() as (conn, cur):
+        try:
+            for size in args.sizes:
+                practice_id, practice_ids, routine_ids = seed(cur, size)
+
+                def attendance(i):
+                    return [PracticeAttendanceUpdate(id=pid, attended=bool(i % 2), late=False, notes=str(i))
+                            for pid in practice_ids]
+
+                def routines(i):
+                    return [RoutineUpdate(id=rid, name=f"routine {rid} v{i}", notes=None) for rid in routine_ids]
+
+                results = {
+                    "attendance per-row": timed(lambda i: update_attendance_per_row(cur, practice_id, attendance(i)), args.repeat),
+                    "attendance bulk": timed(lambda i: update_practice_attendance(cur, practice_id, attendance(i)), args.repeat),
+                    "routines per-row": timed(lambda i: update_routines_per_row(cur, routines(i)), args.repeat),
+                    "routines bulk": timed(lambda i: update_routines_bulk(cur, routines(i)), args.repeat),
+                }
+                for label, median in results.items():
+                    print(f"{size:5} records  {label:20} median={median:.2f}ms")
+        finally:
+            conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Time the carpool matcher on synthetic events.
+
+Pure Python, no database needed. Usage:
+
+    python -m benchmarks.carpool --sizes 100 1000 5000 --repeat 20
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from carpool import match_carpools
+
+AREAS = ["Northgate", "Capitol Hill", "Ballard", "UW", "Bellevue", "Tacoma", None]
+
+
+def synthetic_event(size, rng):
+    # Roughly one driver per four attendees, a few with no hint
+    drivers, passengers = [], []
+    for i in range(size):
+        person = {"attendance_id": i, "user_id": i, "location_hint": rng.choice(AREAS)}
+        if rng.random() < 0.25:
+            drivers.append({**person, "seats_available": rng.randint(0, 6)})
+        else:
+            passengers.append(person)
+    return drivers, passengers
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for size in args.sizes:
+        drivers, passengers = synthetic_event(size, rng)
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            plan = match_carpools(drivers, passengers)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(
+            f"{size:6} attendees  drivers={len(drivers):5}  unassigned={len(plan['unassigned']):5}  "
+            f"median={statistics.median(timings):.2f}ms  max={max(timings):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
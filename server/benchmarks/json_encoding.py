@@ -0,0 +1,95 @@
+"""Serialization time for /users- and /events-sized payloads.
+
+Compares the old path (model_dump() every row, then Flask's stdlib encoder)
+with FastJSONProvider encoding the models directly. No database needed:
+
+    python -m benchmarks.json_encoding --sizes 100 1000 10000 --repeat 20
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from json_provider import FastJSONProvider, orjson
+from models import AttendanceSummary, EventWithAttendance, UserMe
+
+
+def users(size):
+    return [
+        UserMe(
+            id=i,
+            first_name=f"First{i}",
+            last_name=f"Last{i}",
+            email=f"user{i}@example.com",
+            username=f"user{i}",
+            admin=i % 20 == 0,
+            type="maid" if i % 2 else "butler",
+            availability={"mon": True, "wed": False, "sat": True},
+        )
+        for i in range(size)
+    ]
+
+
+def events(size):
+    start = datetime(2026, 11, 1, 18)
+    return [
+        EventWithAttendance(
+            id=i,
+            title=f"Cafe night {i}",
+            description="Maid cafe pop-up",
+            start_datetime=start + timedelta(days=i),
+            end_datetime=start + timedelta(days=i, hours=3),
+            created_by=1,
+            location="Seattle",
+            max_attendees=40,
+            status="published",
+            attendance=AttendanceSummary(going=12, maybe=3, drivers=2, seats_offered=6, remaining=28),
+        )
+        for i in range(size)
+    ]
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    print("encoder:", "orjson" if orjson else "stdlib (orjson not installed)")
+
+    with app.app_context():
+        for label, build in (("/users", users), ("/events", events)):
+            for size in args.sizes:
+                rows = build(size)
+
+                def before():
+                    stdlib.response({"success": True, "data": [r.model_dump() for r in rows], "error": None})
+
+                def after():
+                    fast.response({"success": True, "data": rows, "error": None})
+
+                old, new = timed(before, args.repeat), timed(after, args.repeat)
+                print(
+                    f"{label:8} {size:6} rows  model_dump+stdlib={old:8.2f}ms  "
+                    f"fast={new:8.2f}ms  speedup={old / new:5.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Python-built vs Postgres-built JSON for the large list endpoints.
+
+Seeds users and one practice session's attendance inside a transaction that
+is rolled back at the end, then times fetching + encoding /users and
+/practice-sessions/<id>/attendance both ways, with tracemalloc peaks. Usage:
+
+    python -m benchmarks.json_lists --sizes 1000 10000 --repeat 10
+"""
+
+import argparse
+import json
+import statistics
+import time
+import tracemalloc
+
+from flask import Flask
+
+from json_provider import FastJSONProvider, RawJSON
+from queries.practice_queries import get_practice_attendance, get_practice_attendance_json
+from queries.user_queries import get_users, get_users_json
+from utils import get_db
+
+
+def seed(cur, size):
+    cur.execute(
+        "INSERT INTO practice_sessions (title, date) VALUES ('bench', now()) RETURNING id;"
+    )
+    practice_id = cur.fetchone()[0]
+    cur.execute(
+        """
+        WITH new_users AS (
+            INSERT INTO users (first_name, last_name, email, username, password, availability)
+            SELECT 'Bench', 'User ' || g, 'json-%s-' || g || '@example.com', 'json-%s-' || g, 'x',
+                   '{"mon": true, "sat": false}'
+            FROM generate_series(1, %s) g
+            RETURNING id
+        )
+        INSERT INTO practices (user_id, practice_session_id, attended, late)
+        SELECT id, %s, true, false FROM new_users;
+        """,
+        (practice_id, practice_id, size, practice_id),
+    )
+    return practice_id
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    provider = FastJSONProvider(app)
+
+    def encode(data):
+        return provider.response({"success": True, "data": data, "error": None}).get_data()
+
+    with app.app_context(), get_db() as (conn, cur):
+        try:
+            for size in args.sizes:
+                practice_id = seed(cur, size)
+                cases = {
+                    "/users": (lambda: get_users(cur), lambda: RawJSON(get_users_json(cur))),
+                    "/practice-sessions/<id>/attendance": (
+                        lambda: get_practice_attendance(cur, practice_id),
+                        lambda: RawJSON(get_practice_attendance_json(cur, practice_id)),
+                    ),
+                }
+                for label, (python_rows, postgres_json) in cases.items():
+                    same = json.loads(encode(python_rows())) == json.loads(encode(postgres_json()))
+                    py_ms, py_mib = measure(lambda: encode(python_rows()), args.repeat)
+                    pg_ms, pg_mib = measure(lambda: encode(postgres_json()), args.repeat)
+                    print(
+                        f"{label:36} +{size:6} rows  python={py_ms:8.2f}ms/{py_mib:6.2f}MiB  "
+                        f"postgres={pg_ms:8.2f}ms/{pg_mib:6.2f}MiB  same={same}"
+                    )
+        finally:
+            conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Login throughput under concurrency, and what it does to other requests.
+
+Runs --threads clients posting /auth/login in a loop while one more client
+polls /events, then reports login rate, latencies and DB pool waits. Only
+HTTP routes are used, so the same script can be run on an older checkout for
+a before/after comparison. Tune with BCRYPT_WORKERS / BCRYPT_ROUNDS / DB_POOL_MAX.
+Usage:
+
+    DB_POOL_MAX=4 python -m benchmarks.login_throughput --email a@b.c --password pw --threads 16
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from main import app
+from utils import db_stats
+
+
+def percentile(timings, p):
+    timings = sorted(timings)
+    return timings[min(len(timings) - 1, int(len(timings) * p))]
+
+
+def worker(path, body, deadline, timings, errors):
+    with app.test_client() as client:
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            res = client.post(path, json=body) if body else client.get(path)
+            timings.append((time.perf_counter() - start) * 1000)
+            if res.status_code != 200:
+                errors.append(res.status_code)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    login = {"email": args.email, "password": args.password}
+    deadline = time.monotonic() + args.seconds
+    logins, reads, errors = [], [], []
+
+    threads = [
+        threading.Thread(target=worker, args=("/auth/login", login, deadline, logins, errors))
+        for _ in range(args.threads)
+    ]
+    threads.append(
+        threading.Thread(target=worker, args=("/events?page=1&quantity=10", None, deadline, reads, errors))
+    )
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    pool = db_stats()["primary"]
+    print(f"logins      {len(logins) / args.seconds:.1f}/s  mean={statistics.mean(logins):.1f}ms "
+          f"p50={percentile(logins, 0.5):.1f}ms p99={percentile(logins, 0.99):.1f}ms")
+    print(f"/events     {len(reads) / args.seconds:.1f}/s  mean={statistics.mean(reads):.1f}ms "
+          f"p50={percentile(reads, 0.5):.1f}ms p99={percentile(reads, 0.99):.1f}ms")
+    print(f"db pool     avg_wait={pool.get('avg_wait_ms')}ms max_wait={pool.get('max_wait_ms')}ms "
+          f"timeouts={pool.get('timeouts')}")
+    print(f"errors      {len(errors)} {sorted(set(errors))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Latency of /events and /auth/me with and without prepared statements.
+
+Needs a populated database (see README). Usage:
+
+    python -m benchmarks.prepared_statements --user-id 1 --requests 2000
+"""
+
+import argparse
+import statistics
+import time
+
+import prepared
+from auth import create_token
+from main import app
+
+
+def run(client, path, headers, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        res = client.get(path, headers=headers)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert res.status_code == 200, res.get_json()
+    timings.sort()
+    return statistics.mean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {create_token(args.user_id, False)}"}
+    paths = ["/events?page=1&quantity=10", "/events?page=1&quantity=10&search_term=cafe", "/auth/me"]
+
+    with app.test_client() as client:
+        for enabled in (False, True):
+            prepared.ENABLED = enabled
+            label = "prepared" if enabled else "plain"
+            for path in paths:
+                run(client, path, headers, 50)  # warm up pool and plans
+                mean, p50, p99 = run(client, path, headers, args.requests)
+                print(f"{label:9} {path:50} mean={mean:.3f}ms p50={p50:.3f}ms p99={p99:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
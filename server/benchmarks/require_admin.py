@@ -0,0 +1,69 @@
+"""Cost of the @require_admin check with a role-claim token vs a legacy token.
+
+Legacy tokens (user_id only) need a users lookup on every request; tokens with
+role + version claims are checked against the in-process version cache. Needs
+a database with an admin user. Usage:
+
+    python -m benchmarks.require_admin --user-id 1 --requests 5000
+"""
+
+import argparse
+import datetime
+import statistics
+import time
+
+import jwt
+
+from auth import SECRET_KEY, create_token
+from main import app
+from middleware import require_admin
+from queries.user_queries import get_user_by_id, get_token_version
+from utils import get_db, release_request_db
+
+
+@require_admin
+def admin_only(user_id):
+    return user_id
+
+
+def legacy_token(user_id):
+    payload = {"user_id": user_id, "exp": datetime.datetime.now() + datetime.timedelta(days=1)}
+    return jwt.encode(payload, SECRET_KEY, algorithm="HS256")
+
+
+def run(token, requests):
+    headers = {"Authorization": f"Bearer {token}"}
+    timings = []
+    for _ in range(requests):
+        with app.test_request_context(headers=headers):
+            start = time.perf_counter()
+            admin_only()
+            timings.append((time.perf_counter() - start) * 1000)
+            release_request_db()
+    timings.sort()
+    return statistics.mean(timings), timings[len(timings) // 2], timings[int(len(timings) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    with get_db() as (conn, cur):
+        if get_user_by_id(cur, args.user_id) is None:
+            raise SystemExit(f"User {args.user_id} does not exist")
+        version = get_token_version(cur, args.user_id)
+
+    tokens = {
+        "legacy (db lookup)": legacy_token(args.user_id),
+        "claims + version cache": create_token(args.user_id, False, True, version),
+    }
+    for label, token in tokens.items():
+        run(token, 50)  # warm up pool, prepared statements and cache
+        mean, p50, p99 = run(token, args.requests)
+        print(f"{label:24} mean={mean:.4f}ms p50={p50:.4f}ms p99={p99:.4f}ms")
+
+
+if __name__ == "__main__":
+    main()
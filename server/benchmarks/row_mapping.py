@@ -0,0 +1,79 @@
+"""CPU and memory cost of turning query rows into models.
+
+Compares validated construction (Model(**fields), what the read paths used to
+do), pydantic's model_construct() and rows.row_builder() on synthetic user and
+event rows. No database needed:
+
+    python -m benchmarks.row_mapping --rows 10000 --repeat 10
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from models import Event, UserMe
+from queries.event_queries import EVENT_FIELDS
+from rows import row_builder
+
+USER_FIELDS = ("id", "first_name", "last_name", "email", "username", "admin", "type", "availability")
+
+
+def user_rows(count):
+    return [
+        (i, f"First{i}", f"Last{i}", f"user{i}@example.com", f"user{i}", i % 20 == 0, "maid", {"mon": True})
+        for i in range(count)
+    ]
+
+
+def event_rows(count):
+    start = datetime(2026, 11, 1, 18)
+    return [
+        (i, f"Cafe night {i}", "Pop-up", start + timedelta(days=i), start + timedelta(days=i, hours=3),
+         1, "Seattle", 40, "published")
+        for i in range(count)
+    ]
+
+
+def strategies(model, columns):
+    build = row_builder(model, columns)
+    return {
+        "validated": lambda rows: [model(**dict(zip(columns, row))) for row in rows],
+        "model_construct": lambda rows: [model.model_construct(**dict(zip(columns, row))) for row in rows],
+        "row_builder": lambda rows: [build(row) for row in rows],
+    }
+
+
+def measure(func, rows, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    kept = func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return statistics.median(timings), peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, model, columns, rows in (
+        ("users", UserMe, USER_FIELDS, user_rows(args.rows)),
+        ("events", Event, EVENT_FIELDS, event_rows(args.rows)),
+    ):
+        for name, func in strategies(model, columns).items():
+            median, peak = measure(func, rows, args.repeat)
+            print(f"{label:7} {args.rows} rows  {name:16} median={median:8.2f}ms  peak={peak:6.2f}MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Response cache for public, read-mostly GET routes.
+
+Cached responses are keyed on the path, the query args and the current
+version of each tag the route declares. Write paths call invalidate() with
+the tags they touch, which bumps those versions so older entries are never
+read again; they age out through TTL/LRU eviction. This works the same way
+for the in-process backend and for a shared backend (CACHE_URL=redis://...)
+used when several workers need to see each other's invalidations.
+
+Cache misses read from the primary even when the view asks for a read-only
+(replica) connection: a lagging replica could otherwise hand back data from
+before a write, which would then be cached under the post-write version.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, after_this_request, g, has_request_context, make_response, request
+
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "1") != "0"
+CACHE_TTL = float(os.getenv("CACHE_TTL", 30))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 2000))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# Larger bodies are not worth evicting everything else for
+CACHE_MAX_ITEM_BYTES = int(os.getenv("CACHE_MAX_ITEM_BYTES", 1024 * 1024))
+CACHE_URL = os.getenv("CACHE_URL")
+
+
+# ── Backends ──────────────────────────────────────────────────────────────────
+
+
+class MemoryBackend:
+    """Per-process LRU with TTL, bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._bytes = 0
+        self._evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        size = len(key) + len(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(key) + len(value)
+
+    def get_versions(self, tags):
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self._evictions,
+            }
+
+
+class RedisBackend:
+    """Shared backend so invalidations reach every worker. Needs `pip install redis`."""
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._redis.get("resp:" + key)
+
+    def set(self, key, value, ttl):
+        self._redis.set("resp:" + key, value, ex=max(1, int(ttl)))
+
+    def get_versions(self, tags):
+        values = self._redis.mget(["tag:" + tag for tag in tags])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump(self, tags):
+        pipe = self._redis.pipeline()
+        for tag in tags:
+            pipe.incr("tag:" + tag)
+        pipe.execute()
+
+    def stats(self):
+        info = self._redis.info("memory")
+        return {"backend": "redis", "bytes": info.get("used_memory")}
+
+
+# ── Cache ─────────────────────────────────────────────────────────────────────
+
+
+_backend = RedisBackend(CACHE_URL) if CACHE_URL else MemoryBackend()
+_counter_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def set_backend(backend):
+    global _backend
+    _backend = backend
+
+
+def _count(hit):
+    global _hits, _misses
+    with _counter_lock:
+        if hit:
+            _hits += 1
+        else:
+            _misses += 1
+
+
+def _cache_key(tags, versions):
+    args = "&".join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+    tagged = ",".join(f"{tag}@{version}" for tag, version in zip(tags, versions))
+    raw = f"{request.path}?{args}|{tagged}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _pack(response):
+    etag = response.headers.get("ETag", "")
+    header = f"{response.status_code:03d}{response.mimetype}\t{etag}\n"
+    return header.encode() + response.get_data()
+
+
+def _unpack(value):
+    header, body = value.split(b"\n", 1)
+    mimetype, etag = header[3:].decode().split("\t", 1)
+    response = Response(body, int(header[:3]), mimetype=mimetype)
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+        response.make_conditional(request)
+    return response
+
+
+def cached(*tag_templates, ttl=None):
+    """Cache successful GET responses of a view.
+
+    Tags may reference view arguments or query args, e.g. "event:{event_id}"
+    or "links:{category}"; invalidate() the same tags when the data changes.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not CACHE_ENABLED or request.method != "GET":
+                return func(*args, **kwargs)
+
+            fields = {**request.args.to_dict(), **kwargs}
+            tags = [template.format_map(_Missing(fields)) for template in tag_templates]
+            key = _cache_key(tags, _backend.get_versions(tags))
+
+            value = _backend.get(key)
+            if value is not None:
+                _count(True)
+                response = _unpack(value)
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            _count(False)
+            # Read by utils.get_db(readonly=True); see the module docstring
+            g.primary_reads = True
+            response = func(*args, **kwargs)
+            # Views return (response, status) tuples; normalize before storing
+            response = make_response(response)
+            if 200 <= response.status_code < 300 and not response.is_streamed:
+                value = _pack(response)
+                if len(value) <= CACHE_MAX_ITEM_BYTES:
+                    _backend.set(key, value, CACHE_TTL if ttl is None else ttl)
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+class _Missing(dict):
+    # "links:{category}" with no ?category= becomes "links:"
+    def __missing__(self, key):
+        return ""
+
+
+def invalidate(*tags):
+    """Invalidate every cached response carrying any of these tags.
+
+    Inside a request this is deferred until the view has returned (and its
+    transaction committed), and skipped if the request failed. Together with
+    cached() reading from the primary, a reader can never re-cache data from
+    before the write.
+    """
+    if not has_request_context():
+        _backend.bump(tags)
+        return
+
+    @after_this_request
+    def bump_after_commit(response):
+        if response.status_code < 400:
+            _backend.bump(tags)
+        return response
+
+
+def cache_stats():
+    with _counter_lock:
+        hits, misses = _hits, _misses
+    total = hits + misses
+    return {
+        "enabled": CACHE_ENABLED,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+        **_backend.stats(),
+    }
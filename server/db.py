@@ -1,10 +1,28 @@
 import psycopg2
+import psycopg2.extensions
 import psycopg2.pool
 import os
+import threading
+import time
+from collections import deque
 from dotenv import load_dotenv
 
+from prepared import PreparingConnection
+
 load_dotenv()
 
+POOL_MIN = int(os.getenv("DB_POOL_MIN", 5))
+POOL_MAX = int(os.getenv("DB_POOL_MAX", 50))
+# Seconds a caller waits for a free connection before giving up
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+
+# Optional read replica used by get_db(readonly=True)
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+# Seconds of replay lag after which reads go back to the primary
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", 5))
+# How often replica health/lag is re-checked, and how long a down replica is skipped
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", 5))
+
 
 def _connection_kwargs():
     database_url = os.getenv("DATABASE_URL")
@@ -19,30 +37,280 @@ def _connection_kwargs():
     }
 
 
-_pool = psycopg2.pool.ThreadedConnectionPool(
-    minconn=5,
-    maxconn=50,
-    keepalives=1,
-    keepalives_idle=30,
-    keepalives_interval=10,
-    keepalives_count=5,
-    **_connection_kwargs(),
-)
+class PoolTimeout(psycopg2.pool.PoolError):
+    pass
+
+
+class ConnectionPool:
+    """Thread-safe pool that queues callers (FIFO) instead of failing when saturated.
+
+    A slot is handed directly from the releasing thread to the oldest waiter,
+    so late arrivals can never overtake callers already in the queue.
+    """
+
+    def __init__(self, minconn, maxconn, timeout, **connect_kwargs):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Invalid pool size: min=%s max=%s" % (minconn, maxconn))
+
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self._connect_kwargs = connect_kwargs
+
+        self._lock = threading.Lock()
+        self._idle = deque()
+        self._out = set()
+        self._waiters = deque()
+        self._in_use = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        for _ in range(minconn):
+            self._idle.append(self._connect())
+
+    def _connect(self):
+        return psycopg2.connect(**self._connect_kwargs)
+
+    def _acquire_slot(self, timeout):
+        with self._lock:
+            if self._closed:
+                raise psycopg2.pool.PoolError("connection pool is closed")
+            if self._in_use < self.maxconn and not self._waiters:
+                self._in_use += 1
+                return
+            waiter = threading.Event()
+            self._waiters.append(waiter)
+
+        if waiter.wait(timeout):
+            return
+
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                # A slot was handed over between the timeout and taking the lock
+                return
+            self._timeouts += 1
+        raise PoolTimeout("no connection available within %.1fs" % timeout)
+
+    def _release_slot(self):
+        with self._lock:
+            if self._waiters:
+                # Keep the slot counted as in use and pass it to the oldest waiter
+                self._waiters.popleft().set()
+            else:
+                self._in_use -= 1
+
+    def getconn(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        self._acquire_slot(timeout)
+        waited = time.monotonic() - start
+
+        try:
+            with self._lock:
+                conn = self._idle.pop() if self._idle else None
+                self._checkouts += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            if conn is None or conn.closed:
+                conn = self._connect()
+        except Exception:
+            self._release_slot()
+            raise
+        with self._lock:
+            self._out.add(id(conn))
+        return conn
+
+    def owns(self, conn):
+        with self._lock:
+            return id(conn) in self._out
+
+    def putconn(self, conn, close=False):
+        try:
+            if not close and not conn.closed:
+                status = conn.info.transaction_status
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    close = True
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+
+            with self._lock:
+                self._out.discard(id(conn))
+                keep = (
+                    not close
+                    and not conn.closed
+                    and not self._closed
+                    and len(self._idle) < self.maxconn
+                )
+                if keep:
+                    self._idle.append(conn)
+            if not keep and not conn.closed:
+                conn.close()
+        except Exception:
+            with self._lock:
+                self._out.discard(id(conn))
+            if not conn.closed:
+                conn.close()
+        finally:
+            self._release_slot()
+
+    def closeall(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            if not conn.closed:
+                conn.close()
 
-print("DB Pool initialized")
-print("Used:", _pool._used, "Max:", _pool.maxconn)
+    def stats(self):
+        with self._lock:
+            return {
+                "min": self.minconn,
+                "max": self.maxconn,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiters": len(self._waiters),
+                "checkouts": self._checkouts,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": (
+                    round(self._total_wait / self._checkouts * 1000, 3)
+                    if self._checkouts
+                    else 0.0
+                ),
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
 
 
-def connect_db():
-    return _pool.getconn()
+_POOL_OPTIONS = {
+    "connection_factory": PreparingConnection,
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 5,
+}
+
+_pools = {}
+_pool_lock = threading.Lock()
+
+
+def get_pool(name="primary"):
+    pool = _pools.get(name)
+    if pool is None:
+        with _pool_lock:
+            pool = _pools.get(name)
+            if pool is None:
+                if name == "replica":
+                    connect_kwargs = {"dsn": REPLICA_DATABASE_URL}
+                else:
+                    connect_kwargs = _connection_kwargs()
+                pool = ConnectionPool(
+                    POOL_MIN, POOL_MAX, POOL_TIMEOUT, **_POOL_OPTIONS, **connect_kwargs
+                )
+                _pools[name] = pool
+    return pool
+
+
+# ── Read replica ──────────────────────────────────────────────────────────────
+
+_REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END;
+"""
+
+_replica = {"healthy": True, "lag": None, "checked_at": 0.0}
+_replica_check_lock = threading.Lock()
+
+
+def _replica_check_due():
+    return time.monotonic() - _replica["checked_at"] >= REPLICA_CHECK_INTERVAL
+
+
+def _mark_replica(healthy, lag=None):
+    _replica.update(healthy=healthy, lag=lag, checked_at=time.monotonic())
+
+
+def _replica_lag_ok(pool, conn):
+    # Only one thread re-checks the lag; everyone else uses the last result
+    if not _replica_check_due() or not _replica_check_lock.acquire(blocking=False):
+        return _replica["healthy"]
+    try:
+        with conn.cursor() as cur:
+            cur.execute(_REPLICA_LAG_SQL)
+            lag = float(cur.fetchone()[0])
+        conn.rollback()
+        _mark_replica(lag <= REPLICA_MAX_LAG, lag)
+    except psycopg2.Error:
+        _mark_replica(False)
+    finally:
+        _replica_check_lock.release()
+    return _replica["healthy"]
+
+
+def _connect_replica(timeout):
+    if not _replica["healthy"] and not _replica_check_due():
+        return None
+
+    try:
+        pool = get_pool("replica")
+        conn = pool.getconn(timeout)
+    except PoolTimeout:
+        return None
+    except psycopg2.Error:
+        _mark_replica(False)
+        return None
+
+    if _replica_lag_ok(pool, conn):
+        return conn
+    pool.putconn(conn, close=conn.closed)
+    return None
+
+
+def connect_db(timeout=None, readonly=False):
+    """Check out a connection. readonly=True prefers the replica when it is
+    configured, reachable and within DB_REPLICA_MAX_LAG, else uses the primary."""
+    if readonly and REPLICA_DATABASE_URL:
+        conn = _connect_replica(timeout)
+        if conn is not None:
+            return conn
+    return get_pool().getconn(timeout)
 
 
 def release_db(conn):
-    _pool.putconn(conn)
+    # A snapshot, since get_pool() may add the replica pool from another thread
+    for pool in tuple(_pools.values()):
+        if pool.owns(conn):
+            pool.putconn(conn)
+            return
+    conn.close()
+
+
+def pool_stats():
+    stats = {}
+    for name in ("primary", "replica"):
+        pool = _pools.get(name)
+        stats[name] = {"initialized": pool is not None}
+        if pool is not None:
+            stats[name].update(pool.stats())
+
+    stats["replica"].update(
+        configured=bool(REPLICA_DATABASE_URL),
+        healthy=_replica["healthy"],
+        lag_seconds=_replica["lag"],
+    )
+    return stats
 
 
 if __name__ == "__main__":
     conn = connect_db()
     cur = conn.cursor()
     print("Connected to the database!")
-    release_db(conn)
\ No newline at end of file
+    print("Pool:", pool_stats())
+    release_db(conn)
@@ -0,0 +1,101 @@
+"""JSON encoding for API responses.
+
+FastJSONProvider encodes with orjson (`pip install orjson`) and falls back to
+Flask's stdlib encoder when it is not installed. Either way pydantic models
+can be returned as-is: they are encoded straight from their field values, so
+routes do not need to build a model_dump() copy of every row first.
+
+Datetimes keep Flask's HTTP-date format and keys stay sorted, so payloads
+read the same whichever encoder is in use.
+
+Large list endpoints can instead have Postgres build the JSON (json_agg) and
+wrap the text in RawJSON, which is spliced into the envelope without being
+parsed; DB_JSON_RESPONSES=0 switches them back to building models.
+"""
+
+import json
+import os
+from datetime import date, datetime, time, timezone
+
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.Fragment (3.9+) splices RawJSON text; older orjson re-parses it instead
+_Fragment = getattr(orjson, "Fragment", None)
+
+DB_JSON_RESPONSES = os.getenv("DB_JSON_RESPONSES", "1") != "0"
+
+
+class RawJSON:
+    """JSON text that is already encoded, e.g. by json_agg() in a query."""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+
+_DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def _http_date(value):
+    # Same output as werkzeug's http_date(), without the email.utils round trip
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time())
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return (
+        f"{_DAYS[value.weekday()]}, {value.day:02d} {_MONTHS[value.month - 1]} "
+        f"{value.year:04d} {value.hour:02d}:{value.minute:02d}:{value.second:02d} GMT"
+    )
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        # Nested models and datetimes come back through here
+        return obj.__dict__
+    if isinstance(obj, date):
+        return _http_date(obj)
+    if isinstance(obj, RawJSON):
+        # The stdlib encoder cannot splice text, so it re-parses it
+        return json.loads(obj.text)
+    return DefaultJSONProvider.default(obj)
+
+
+def _orjson_default(obj):
+    if isinstance(obj, RawJSON) and _Fragment is not None:
+        return _Fragment(obj.text)
+    return _default(obj)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+
+    def _options(self, indent=False):
+        # Datetimes go through _default so they match the stdlib encoder
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs):
+        # Callers asking for stdlib json.dumps options get the stdlib encoder
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_orjson_default, option=self._options()).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson is None:
+            return super().response(obj)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=_orjson_default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
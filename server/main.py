@@ -2,7 +2,9 @@ from flask import Flask
 from flask_cors import CORS
 import traceback
 import os
-from utils import APIError
+from cache import cache_stats
+from json_provider import FastJSONProvider
+from utils import APIError, db_stats, release_request_db, success_response
 from routes.auth_routes import auth_bp
 from routes.user_routes import user_bp
 from routes.event_routes import event_bp
@@ -10,15 +12,20 @@ from routes.attendance_routes import attendance_bp
 from routes.practice_routes import practice_bp
 from routes.invite_routes import invite_bp
 from routes.link_routes import link_bp
+from routes.export_routes import export_bp
 
 print("PORT:", os.getenv("PORT"))
 
-app = Flask(__name__)
-CORS(app, supports_credentials=True, origins=[
+CORS_ORIGINS = [
     "http://localhost:3000",
     "http://192.168.4.103:3000",
     "https://maid-cafe-gxuv.vercel.app"
-])
+]
+
+app = Flask(__name__)
+# orjson-backed when installed; lets routes return pydantic models directly
+app.json = FastJSONProvider(app)
+CORS(app, supports_credentials=True, origins=CORS_ORIGINS)
 
 # Register blueprints
 app.register_blueprint(auth_bp)
@@ -28,6 +35,10 @@ app.register_blueprint(attendance_bp)
 app.register_blueprint(practice_bp)
 app.register_blueprint(invite_bp)
 app.register_blueprint(link_bp)
+app.register_blueprint(export_bp)
+
+# Return the request's pooled connection once the response is done
+app.teardown_appcontext(release_request_db)
 
 
 # Error handlers
@@ -56,5 +67,15 @@ def home():
     return {"success": True}
 
 
+@app.route("/health/db")
+def db_health():
+    return success_response(db_stats())
+
+
+@app.route("/health/cache")
+def cache_health():
+    return success_response(cache_stats())
+
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000, debug=True)
@@ -1,11 +1,10 @@
 from functools import wraps
 
-from flask import request
+from flask import g, request
 
-from auth import verify_token
-from db import connect_db
-from queries.user_queries import get_me
-from utils import APIError
+from auth import cached_token_version, decode_token, remember_token_version, verify_token
+from queries.user_queries import get_me, get_token_version
+from utils import APIError, get_db
 
 # COOKIE VERSION
 
@@ -85,20 +84,53 @@ def require_admin(func):
             raise APIError("UNAUTHORIZED", "Not logged in", 401)
 
         token = auth_header.split(" ")[1]
-        user_id = verify_token(token)
+        claims = decode_token(token)
 
-        if not user_id:
+        if not claims:
             raise APIError("UNAUTHORIZED", "Invalid token", 401)
-
-        conn = connect_db()
-        cur = conn.cursor()
-        try:
-            user = get_me(cur, user_id)
-            if not user.admin:
-                raise APIError("FORBIDDEN", "Admins only", 403)
-        finally:
-            conn.close()
+        user_id = claims["user_id"]
+
+        if claims_are_current(user_id, claims):
+            admin = claims["admin"]
+        else:
+            # Old-style or outdated token: check the user's current role. Uses
+            # the request's shared connection, so the handler's get_db() does
+            # not check out a second one
+            with get_db() as (conn, cur):
+                user = load_current_user(cur, user_id)
+            if user is None:
+                raise APIError("UNAUTHORIZED", "Invalid token", 401)
+            admin = user.admin
+
+        if not admin:
+            raise APIError("FORBIDDEN", "Admins only", 403)
 
         return func(user_id=user_id, *args, **kwargs)
 
     return wrapper
+
+
+def claims_are_current(user_id, claims):
+    """True if the token was issued at the user's current token version, so its
+    role claim can be trusted. Versions are cached for TOKEN_VERSION_TTL, which
+    keeps the common case free of DB lookups."""
+    if "ver" not in claims:
+        return False
+
+    version = cached_token_version(user_id)
+    if version is None:
+        with get_db() as (conn, cur):
+            version = get_token_version(cur, user_id)
+        if version is None:
+            return False
+        remember_token_version(user_id, version)
+    return version == claims["ver"]
+
+
+def load_current_user(cur, user_id):
+    """Return the logged in user, reusing the lookup done by require_admin."""
+    user = g.get("current_user")
+    if user is None or user.id != user_id:
+        user = get_me(cur, user_id)
+        g.current_user = user
+    return user
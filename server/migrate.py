@@ -0,0 +1,87 @@
+"""Bring a database up to the current schema.
+
+Applies every migrations/NNNN_*.sql file that has not been recorded in
+schema_migrations yet, in order, each in its own transaction. Safe to run on
+every deploy:
+
+    python migrate.py            # apply pending migrations
+    python migrate.py --status   # list applied / pending migrations
+"""
+
+import sys
+from pathlib import Path
+
+import psycopg2
+
+from db import _connection_kwargs
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+# Arbitrary key for pg_advisory_lock so concurrent deploys don't race
+MIGRATION_LOCK_ID = 72610001
+
+
+def migration_files():
+    return sorted(MIGRATIONS_DIR.glob("[0-9][0-9][0-9][0-9]_*.sql"))
+
+
+def applied_versions(cur):
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version TEXT PRIMARY KEY,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+    )
+    cur.execute("SELECT version FROM schema_migrations;")
+    return {row[0] for row in cur.fetchall()}
+
+
+def migrate(conn):
+    applied = []
+    cur = conn.cursor()
+    cur.execute("SELECT pg_advisory_lock(%s);", (MIGRATION_LOCK_ID,))
+    try:
+        done = applied_versions(cur)
+        conn.commit()
+
+        for path in migration_files():
+            version = path.stem
+            if version in done:
+                continue
+            try:
+                cur.execute(path.read_text())
+                cur.execute(
+                    "INSERT INTO schema_migrations (version) VALUES (%s);", (version,)
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(version)
+    finally:
+        cur.execute("SELECT pg_advisory_unlock(%s);", (MIGRATION_LOCK_ID,))
+        conn.commit()
+        cur.close()
+    return applied
+
+
+def status(conn):
+    with conn.cursor() as cur:
+        done = applied_versions(cur)
+    conn.commit()
+    return [(path.stem, path.stem in done) for path in migration_files()]
+
+
+if __name__ == "__main__":
+    conn = psycopg2.connect(**_connection_kwargs())
+    try:
+        if "--status" in sys.argv:
+            for version, is_applied in status(conn):
+                print(("applied  " if is_applied else "pending  ") + version)
+        else:
+            applied = migrate(conn)
+            print("Applied:", ", ".join(applied) if applied else "nothing, already up to date")
+    finally:
+        conn.close()
@@ -1,6 +1,8 @@
 -- ================================================
 -- Maid Cafe Database Schema
 -- ================================================
+-- Baseline schema. Safe to run against a database that was created from the
+-- old schema.sql; later migrations bring older databases up to date.
 
 -- Users
 CREATE TABLE IF NOT EXISTS users (
@@ -123,7 +125,6 @@ CREATE TABLE IF NOT EXISTS links(
     id SERIAL PRIMARY KEY,
     category TEXT NOT NULL,
     link_url TEXT NOT NULL,
+    title TEXT,
     UNIQUE(category, link_url)
 );
-
-CREATE INDEX idx_links_category ON links(category);
\ No newline at end of file
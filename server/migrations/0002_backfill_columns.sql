@@ -0,0 +1,50 @@
+-- ================================================
+-- Columns and constraints missing from databases that were created with the
+-- old initializedb.py (users/events/attendances/tasks only)
+-- ================================================
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS type VARCHAR(20);
+ALTER TABLE users ADD COLUMN IF NOT EXISTS availability JSONB DEFAULT '{}'::jsonb;
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'draft';
+
+ALTER TABLE attendances ADD COLUMN IF NOT EXISTS role VARCHAR(10);
+ALTER TABLE attendances ADD COLUMN IF NOT EXISTS seats_available INT;
+ALTER TABLE attendances ALTER COLUMN notes DROP NOT NULL;
+
+ALTER TABLE links ADD COLUMN IF NOT EXISTS title TEXT;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'user_type_check') THEN
+        ALTER TABLE users ADD CONSTRAINT user_type_check
+            CHECK (type IN ('maid', 'butler') OR type IS NULL);
+    END IF;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conrelid = 'attendances'::regclass AND contype = 'u'
+    ) THEN
+        ALTER TABLE attendances ADD CONSTRAINT attendances_user_id_event_id_key
+            UNIQUE (user_id, event_id);
+    END IF;
+
+    -- Deleting an event removes its attendances and tasks
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'attendances_event_id_fkey' AND confdeltype <> 'c'
+    ) THEN
+        ALTER TABLE attendances DROP CONSTRAINT attendances_event_id_fkey;
+        ALTER TABLE attendances ADD CONSTRAINT attendances_event_id_fkey
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE;
+    END IF;
+
+    IF EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'tasks_event_id_fkey' AND confdeltype <> 'c'
+    ) THEN
+        ALTER TABLE tasks DROP CONSTRAINT tasks_event_id_fkey;
+        ALTER TABLE tasks ADD CONSTRAINT tasks_event_id_fkey
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE;
+    END IF;
+END $$;
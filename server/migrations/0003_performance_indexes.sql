@@ -0,0 +1,25 @@
+-- ================================================
+-- Indexes for the columns the query modules filter, join and sort on.
+-- Primary keys and UNIQUE constraints already cover:
+--   users(id), users(email), events(id), invite_codes(code),
+--   practices(user_id, ...), practice_session_routines(practice_session_id, ...)
+-- ================================================
+
+-- attendance_queries: WHERE user_id = ...; event_queries: JOIN/WHERE event_id = ...
+CREATE INDEX IF NOT EXISTS idx_attendances_user_id ON attendances(user_id);
+CREATE INDEX IF NOT EXISTS idx_attendances_event_id ON attendances(event_id);
+
+-- practice_queries: WHERE p.practice_session_id = ...
+CREATE INDEX IF NOT EXISTS idx_practices_practice_session_id ON practices(practice_session_id);
+
+-- practice_queries: JOIN routines ON pr.routine_id = r.id, routine deletes cascade here
+CREATE INDEX IF NOT EXISTS idx_practice_session_routines_routine_id ON practice_session_routines(routine_id);
+
+-- link_queries: WHERE category = ...
+CREATE INDEX IF NOT EXISTS idx_links_category ON links(category);
+
+-- invite_queries: ORDER BY created_at DESC
+CREATE INDEX IF NOT EXISTS idx_invite_codes_created_at ON invite_codes(created_at);
+
+-- task_queries: WHERE event_id = ...
+CREATE INDEX IF NOT EXISTS idx_tasks_event_id ON tasks(event_id);
@@ -0,0 +1,2 @@
+-- Keyset pagination on GET /events?sort=start_date seeks on (start_date, id)
+CREATE INDEX IF NOT EXISTS idx_events_start_date_id ON events(start_date, id);
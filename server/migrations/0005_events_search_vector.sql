@@ -0,0 +1,13 @@
+-- ================================================
+-- Full-text search for GET /events?search_term=
+-- Replaces title/description ILIKE '%term%' scans with an indexed tsvector.
+-- ================================================
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(location, '')), 'C')
+    ) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_events_search_vector ON events USING GIN (search_vector);
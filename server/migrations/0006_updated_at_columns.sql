@@ -0,0 +1,34 @@
+-- ================================================
+-- Row versions for conditional GETs (ETag / If-None-Match).
+-- (count(*), max(updated_at)) changes whenever a row is inserted, updated or
+-- deleted, so list endpoints can answer 304 without reading the rows.
+-- ================================================
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    -- clock_timestamp(), not now(): keep versions distinct within one transaction
+    NEW.updated_at = clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+ALTER TABLE practice_sessions ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+ALTER TABLE users ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp();
+
+DROP TRIGGER IF EXISTS events_set_updated_at ON events;
+CREATE TRIGGER events_set_updated_at BEFORE UPDATE ON events
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS practice_sessions_set_updated_at ON practice_sessions;
+CREATE TRIGGER practice_sessions_set_updated_at BEFORE UPDATE ON practice_sessions
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS users_set_updated_at ON users;
+CREATE TRIGGER users_set_updated_at BEFORE UPDATE ON users
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+-- max(updated_at) becomes a single index probe
+CREATE INDEX IF NOT EXISTS idx_events_updated_at ON events(updated_at);
+CREATE INDEX IF NOT EXISTS idx_practice_sessions_updated_at ON practice_sessions(updated_at);
+CREATE INDEX IF NOT EXISTS idx_users_updated_at ON users(updated_at);
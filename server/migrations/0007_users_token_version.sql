@@ -0,0 +1,20 @@
+-- ================================================
+-- Per-user token version. JWTs carry the role and the version they were
+-- issued at; bumping the version makes the API stop trusting the role claim
+-- of every outstanding token for that user.
+-- ================================================
+
+ALTER TABLE users ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION bump_token_version() RETURNS trigger AS $$
+BEGIN
+    IF NEW.admin IS DISTINCT FROM OLD.admin OR NEW.active IS DISTINCT FROM OLD.active THEN
+        NEW.token_version = OLD.token_version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_bump_token_version ON users;
+CREATE TRIGGER users_bump_token_version BEFORE UPDATE OF admin, active ON users
+    FOR EACH ROW EXECUTE FUNCTION bump_token_version();
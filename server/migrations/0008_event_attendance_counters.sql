@@ -0,0 +1,76 @@
+-- ================================================
+-- Attendance counters on events, kept current by a trigger on attendances so
+-- GET /events?include=attendance reads them straight off the event rows
+-- instead of grouping attendances on every page view.
+--   going_count / maybe_count   attendances with that status
+--   driver_count / seats_offered  'Driver' attendances that are going
+-- ================================================
+
+ALTER TABLE events ADD COLUMN IF NOT EXISTS going_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE events ADD COLUMN IF NOT EXISTS maybe_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE events ADD COLUMN IF NOT EXISTS driver_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE events ADD COLUMN IF NOT EXISTS seats_offered INTEGER NOT NULL DEFAULT 0;
+
+CREATE OR REPLACE FUNCTION apply_attendance_counts() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE events SET
+            going_count = going_count - CASE WHEN OLD.status = 'going' THEN 1 ELSE 0 END,
+            maybe_count = maybe_count - CASE WHEN OLD.status = 'maybe' THEN 1 ELSE 0 END,
+            driver_count = driver_count
+                - CASE WHEN OLD.status = 'going' AND OLD.role = 'Driver' THEN 1 ELSE 0 END,
+            seats_offered = seats_offered
+                - CASE WHEN OLD.status = 'going' AND OLD.role = 'Driver'
+                       THEN COALESCE(OLD.seats_available, 0) ELSE 0 END
+        WHERE id = OLD.event_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE events SET
+            going_count = going_count + CASE WHEN NEW.status = 'going' THEN 1 ELSE 0 END,
+            maybe_count = maybe_count + CASE WHEN NEW.status = 'maybe' THEN 1 ELSE 0 END,
+            driver_count = driver_count
+                + CASE WHEN NEW.status = 'going' AND NEW.role = 'Driver' THEN 1 ELSE 0 END,
+            seats_offered = seats_offered
+                + CASE WHEN NEW.status = 'going' AND NEW.role = 'Driver'
+                       THEN COALESCE(NEW.seats_available, 0) ELSE 0 END
+        WHERE id = NEW.event_id;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS attendances_counts_insert_delete ON attendances;
+CREATE TRIGGER attendances_counts_insert_delete AFTER INSERT OR DELETE ON attendances
+    FOR EACH ROW EXECUTE FUNCTION apply_attendance_counts();
+
+-- Notes-only edits leave the counters (and the event row) alone
+DROP TRIGGER IF EXISTS attendances_counts_update ON attendances;
+CREATE TRIGGER attendances_counts_update AFTER UPDATE ON attendances
+    FOR EACH ROW
+    WHEN (
+        OLD.event_id IS DISTINCT FROM NEW.event_id
+        OR OLD.status IS DISTINCT FROM NEW.status
+        OR OLD.role IS DISTINCT FROM NEW.role
+        OR OLD.seats_available IS DISTINCT FROM NEW.seats_available
+    )
+    EXECUTE FUNCTION apply_attendance_counts();
+
+-- Backfill from the attendances that already exist
+UPDATE events e SET
+    going_count = s.going,
+    maybe_count = s.maybe,
+    driver_count = s.drivers,
+    seats_offered = s.seats
+FROM (
+    SELECT
+        event_id,
+        COUNT(*) FILTER (WHERE status = 'going') AS going,
+        COUNT(*) FILTER (WHERE status = 'maybe') AS maybe,
+        COUNT(*) FILTER (WHERE status = 'going' AND role = 'Driver') AS drivers,
+        COALESCE(SUM(seats_available) FILTER (WHERE status = 'going' AND role = 'Driver'), 0) AS seats
+    FROM attendances
+    GROUP BY event_id
+) s
+WHERE e.id = s.event_id;
@@ -0,0 +1,55 @@
+-- ================================================
+-- Enforce events.max_attendees on sign-up.
+-- The counter UPDATE in apply_attendance_counts() already row-locks the
+-- event, so concurrent sign-ups for one event queue on that lock and each
+-- sees the count left by the previous one. A write that adds a 'going'
+-- attendance past capacity fails with the event_capacity check violation.
+-- Lowering max_attendees below the current count is allowed; it only stops
+-- new sign-ups.
+-- ================================================
+
+CREATE OR REPLACE FUNCTION apply_attendance_counts() RETURNS trigger AS $$
+DECLARE
+    new_going INTEGER;
+    capacity INTEGER;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE events SET
+            going_count = going_count - CASE WHEN OLD.status = 'going' THEN 1 ELSE 0 END,
+            maybe_count = maybe_count - CASE WHEN OLD.status = 'maybe' THEN 1 ELSE 0 END,
+            driver_count = driver_count
+                - CASE WHEN OLD.status = 'going' AND OLD.role = 'Driver' THEN 1 ELSE 0 END,
+            seats_offered = seats_offered
+                - CASE WHEN OLD.status = 'going' AND OLD.role = 'Driver'
+                       THEN COALESCE(OLD.seats_available, 0) ELSE 0 END
+        WHERE id = OLD.event_id;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE events SET
+            going_count = going_count + CASE WHEN NEW.status = 'going' THEN 1 ELSE 0 END,
+            maybe_count = maybe_count + CASE WHEN NEW.status = 'maybe' THEN 1 ELSE 0 END,
+            driver_count = driver_count
+                + CASE WHEN NEW.status = 'going' AND NEW.role = 'Driver' THEN 1 ELSE 0 END,
+            seats_offered = seats_offered
+                + CASE WHEN NEW.status = 'going' AND NEW.role = 'Driver'
+                       THEN COALESCE(NEW.seats_available, 0) ELSE 0 END
+        WHERE id = NEW.event_id
+        RETURNING going_count, max_attendees INTO new_going, capacity;
+
+        -- Only writes that add someone to 'going' are held to capacity
+        IF NEW.status = 'going'
+           AND (TG_OP = 'INSERT'
+                OR OLD.status IS DISTINCT FROM 'going'
+                OR OLD.event_id IS DISTINCT FROM NEW.event_id)
+           AND capacity IS NOT NULL
+           AND new_going > capacity
+        THEN
+            RAISE EXCEPTION 'event % is full', NEW.event_id
+                USING ERRCODE = 'check_violation', CONSTRAINT = 'event_capacity';
+        END IF;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,6 @@
+-- ================================================
+-- Free-text area ("Northgate", "UW campus") a driver leaves from or a
+-- passenger wants picking up in; the carpool matcher groups by it.
+-- ================================================
+
+ALTER TABLE attendances ADD COLUMN IF NOT EXISTS location_hint VARCHAR(100);
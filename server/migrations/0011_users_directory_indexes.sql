@@ -0,0 +1,9 @@
+-- ================================================
+-- GET /users directory pages (user_queries.users_directory_statement).
+-- ?sort=name seeks on (last_name, first_name, id); the type/admin filters
+-- keep their ORDER BY id seek on an index instead of filtering a full scan.
+-- ================================================
+
+CREATE INDEX IF NOT EXISTS idx_users_name ON users(last_name, first_name, id);
+CREATE INDEX IF NOT EXISTS idx_users_type_id ON users(type, id);
+CREATE INDEX IF NOT EXISTS idx_users_admin_id ON users(admin, id);
@@ -0,0 +1,6 @@
+-- ================================================
+-- GET /practice-sessions filters on a date range and pages on (date, id)
+-- (practice_queries.practice_sessions_statement).
+-- ================================================
+
+CREATE INDEX IF NOT EXISTS idx_practice_sessions_date_id ON practice_sessions(date, id);
@@ -60,6 +60,7 @@ class UserAuthorization(UserBase):
     password: str
     admin: bool = False
     active: bool = True
+    token_version: int = 0
 
 
 class Event(BaseModel):
@@ -74,6 +75,18 @@ class Event(BaseModel):
     status: str = "draft"
 
 
+class AttendanceSummary(BaseModel):
+    going: int
+    maybe: int
+    drivers: int
+    seats_offered: int
+    remaining: int | None = None  # None when the event has no max_attendees
+
+
+class EventWithAttendance(Event):
+    attendance: AttendanceSummary
+
+
 class EventUpdate(BaseModel):
     title: str | None = None
     description: str | None = None
@@ -98,6 +111,7 @@ class NewAttendance(BaseModel):
     notes: str | None = None
     role: str | None = None
     seats_available: int | None = None
+    location_hint: str | None = None
 
 
 class Attendance(BaseModel):
@@ -108,12 +122,14 @@ class Attendance(BaseModel):
     notes: str | None = None
     role: str | None = None
     seats_available: int | None = None
+    location_hint: str | None = None
 
 
 class UpdatedAttendance(BaseModel):
     status: str | None = None
     seats_available: int | None = None
     role: str | None = None
+    location_hint: str | None = None
 
 
 class Task(BaseModel):
@@ -127,6 +143,19 @@ class Task(BaseModel):
     completed: bool = False
 
 
+class PracticeAttendanceUpdate(BaseModel):
+    id: int  # practices.id
+    attended: bool
+    late: bool
+    notes: str | None = None
+
+
+class RoutineUpdate(BaseModel):
+    id: int
+    name: str
+    notes: str | None = None
+
+
 class PracticeSession(BaseModel):
     id: int | None = None
     title: str
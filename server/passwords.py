@@ -0,0 +1,51 @@
+"""bcrypt hashing on a small dedicated thread pool.
+
+bcrypt releases the GIL, so BCRYPT_WORKERS threads hash in parallel while the
+request threads wait on them without holding a DB connection. Callers that
+cannot get a slot within BCRYPT_QUEUE_TIMEOUT get a 503 instead of piling up
+behind a burst of logins.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+from utils import APIError
+
+# Work factor for new hashes; existing hashes are upgraded on the next login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", os.cpu_count() or 2))
+# Hashes allowed to run or wait for a worker at once
+BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", BCRYPT_WORKERS * 8))
+BCRYPT_QUEUE_TIMEOUT = float(os.getenv("BCRYPT_QUEUE_TIMEOUT", 5))
+
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_slots = threading.BoundedSemaphore(BCRYPT_MAX_PENDING)
+
+
+def _run(func, *args):
+    if not _slots.acquire(timeout=BCRYPT_QUEUE_TIMEOUT):
+        raise APIError("AUTH_BUSY", "Server is busy, please try again", 503)
+    try:
+        return _executor.submit(func, *args).result()
+    finally:
+        _slots.release()
+
+
+def hash_password(password: str) -> str:
+    salt = bcrypt.gensalt(BCRYPT_ROUNDS)
+    return _run(bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+
+def check_password(password: str, hashed: str) -> bool:
+    return _run(bcrypt.checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+def needs_rehash(hashed: str) -> bool:
+    # "$2b$12$..." -> 12
+    try:
+        return int(hashed.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
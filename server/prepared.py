@@ -0,0 +1,80 @@
+import os
+import re
+
+import psycopg2.extensions
+
+# Set DB_PREPARED_STATEMENTS=0 when running behind a transaction-pooling proxy
+# (e.g. pgbouncer) where session state does not stick to a client connection.
+ENABLED = os.getenv("DB_PREPARED_STATEMENTS", "1") != "0"
+
+_statements = {}
+
+_PLACEHOLDER = re.compile(r"%(s|%)")
+_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Connection that remembers which statements were PREPAREd on its session."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+def _to_server_params(sql):
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group(1) == "%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(replace, sql), count
+
+
+def prepare(name, sql):
+    """Register a statement under a name; query modules run it with execute_prepared().
+
+    The SQL uses the usual psycopg2 %s placeholders. It is PREPAREd lazily, the
+    first time it runs on each pooled connection.
+    """
+    if not _NAME.match(name):
+        raise ValueError(f"Invalid statement name: {name!r}")
+
+    existing = _statements.get(name)
+    if existing is not None:
+        if existing[0] != sql:
+            raise ValueError(f"Statement {name!r} is already registered with different SQL")
+        return name
+
+    server_sql, param_count = _to_server_params(sql.strip().rstrip(";"))
+    _statements[name] = (sql, server_sql, param_count)
+    return name
+
+
+def statement_sql(name):
+    return _statements[name][0]
+
+
+def execute_prepared(db, name, params=()):
+    sql, server_sql, param_count = _statements[name]
+    prepared = getattr(db.connection, "prepared", None)
+
+    # Plain connections (scripts, tests) just run the SQL text
+    if not ENABLED or prepared is None:
+        db.execute(sql, params)
+        return
+
+    if len(params) != param_count:
+        raise ValueError(f"{name} expects {param_count} parameters, got {len(params)}")
+
+    if name not in prepared:
+        db.execute(f"PREPARE {name} AS {server_sql}")
+        prepared.add(name)
+
+    if param_count:
+        db.execute(f"EXECUTE {name} ({', '.join(['%s'] * param_count)})", params)
+    else:
+        db.execute(f"EXECUTE {name}")
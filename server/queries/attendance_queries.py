@@ -1,40 +1,33 @@
 from models import Attendance, NewAttendance, UpdatedAttendance
+from prepared import execute_prepared, prepare
+from rows import build_models
+
+GET_ATTENDANCES_BY_USER = prepare(
+    "get_attendances_by_user",
+    """
+    SELECT id, user_id, event_id, status, notes
+    FROM attendances
+    WHERE user_id = %s;
+    """,
+)
+
+GET_ATTENDANCE_BY_ID = prepare(
+    "get_attendance_by_id",
+    """
+    SELECT id, user_id, event_id, status, notes, role, seats_available, location_hint
+    FROM attendances
+    WHERE id = %s;
+    """,
+)
 
 
 def get_attendances_by_user(db, user_id: int):
-    db.execute(
-        """
-        SELECT id, user_id, event_id, status, notes
-        FROM attendances
-        WHERE user_id = %s;
-        """,
-        (user_id,),
-    )
-    rows = db.fetchall()
-    if not rows:
-        return []
-
-    return [
-        Attendance(
-            id=row[0],
-            user_id=row[1],
-            event_id=row[2],
-            status=row[3],
-            notes=row[4],
-        )
-        for row in rows
-    ]
+    execute_prepared(db, GET_ATTENDANCES_BY_USER, (user_id,))
+    return build_models(Attendance, db.description, db.fetchall())
 
 
 def get_attendance_by_id(db, attendance_id: int):
-    db.execute(
-        """
-        SELECT id, user_id, event_id, status, notes, role, seats_available
-        FROM attendances
-        WHERE id = %s;
-        """,
-        (attendance_id,),
-    )
+    execute_prepared(db, GET_ATTENDANCE_BY_ID, (attendance_id,))
     row = db.fetchone()
     if row is None:
         return None
@@ -46,14 +39,22 @@ def get_attendance_by_id(db, attendance_id: int):
         notes=row[4],
         role=row[5],
         seats_available=row[6],
+        location_hint=row[7],
     )
 
 
 def post_attendance(db, user: NewAttendance):
+    """Sign a user up in one statement; returns None if they already are.
+
+    Capacity is enforced by the attendances trigger (migration 0009), which
+    raises a CheckViolation on constraint "event_capacity" when the event is
+    full. The event row stays locked until commit, so commit promptly.
+    """
     db.execute(
         """
-        INSERT INTO attendances (user_id, event_id, status, notes, role, seats_available)
-        VALUES (%s,%s,%s,%s,%s,%s)
+        INSERT INTO attendances (user_id, event_id, status, notes, role, seats_available, location_hint)
+        VALUES (%s,%s,%s,%s,%s,%s,%s)
+        ON CONFLICT (user_id, event_id) DO NOTHING
         RETURNING id;
         """,
         (
@@ -63,9 +64,11 @@ def post_attendance(db, user: NewAttendance):
             user.notes,
             user.role,
             user.seats_available,
+            user.location_hint,
         ),
     )
-    return db.fetchone()[0]
+    row = db.fetchone()
+    return row[0] if row else None
 
 
 def update_attendance(db, attendance_id: int, data: UpdatedAttendance):
@@ -82,6 +85,9 @@ def update_attendance(db, attendance_id: int, data: UpdatedAttendance):
     if data.role is not None:
         fields.append("role = %s")
         values.append(data.role)
+    if data.location_hint is not None:
+        fields.append("location_hint = %s")
+        values.append(data.location_hint)
 
     if not fields:
         return None
@@ -110,49 +116,3 @@ def delete_attendance(db, attendance_id: int):
     )
     row = db.fetchone()
     return row[0] if row else None
-
-
-def insert_practice_attendance(db, practice_id: int, attendees: list[int]):
-    for user_id in attendees:
-        db.execute(
-            """
-            INSERT INTO practices (user_id, practice_session_id, attended)
-            VALUES (%s, %s, TRUE)
-            ON CONFLICT (user_id, practice_session_id) DO NOTHING;
-            """,
-            (user_id, practice_id),
-        )
-
-
-# TODO: Testing race conditions
-
-# with get_db() as (conn, cur):
-#     # Lock the event row so no one else can read it until we're done
-#     cur.execute("""
-#         SELECT remaining_seats
-#         FROM events
-#         WHERE id = %s
-#         FOR UPDATE
-#     """, (event_id,))
-
-#     row = cur.fetchone()
-#     if not row:
-#         raise APIError("EVENT_NOT_FOUND", ...)
-
-#     seats = row[0]
-
-#     if seats <= 0:
-#         raise APIError("FULL", "No seats left")
-
-#     # Decrement seat count
-#     cur.execute("""
-#         UPDATE events
-#         SET remaining_seats = remaining_seats - 1
-#         WHERE id = %s
-#     """, (event_id,))
-
-#     # Insert attendance
-#     cur.execute("""
-#         INSERT INTO attendances (...)
-#         RETURNING id
-#     """, (...))
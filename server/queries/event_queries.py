@@ -1,4 +1,21 @@
-from models import AdminEventInfo, Event, EventUpdate
+import re
+
+from models import AdminEventInfo, AttendanceSummary, Event, EventUpdate, EventWithAttendance
+from prepared import execute_prepared, prepare
+from rows import row_builder
+
+GET_EVENT_BY_ID = prepare(
+    "get_event_by_id",
+    """
+    SELECT id, title, description, start_date, end_date, created_by, location, max_attendees, status
+    FROM events
+    WHERE id = %s;
+    """,
+)
+
+GET_EVENTS_VERSION = prepare(
+    "get_events_version", "SELECT count(*), max(updated_at) FROM events;"
+)
 
 
 def create_event(db, event: Event):
@@ -22,99 +39,246 @@ def create_event(db, event: Event):
     return db.fetchone()[0]
 
 
+def get_events_version(db):
+    """Changes whenever an event is created, edited or deleted (ETag validator)."""
+    execute_prepared(db, GET_EVENTS_VERSION)
+    return db.fetchone()
+
+
+# Event field for each column of EVENT_COLUMNS, in order
+EVENT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "start_datetime",
+    "end_datetime",
+    "created_by",
+    "location",
+    "max_attendees",
+    "status",
+)
+
+_build_event = row_builder(Event, EVENT_FIELDS)
+_build_event_with_attendance = row_builder(EventWithAttendance, EVENT_FIELDS + ("attendance",))
+_build_attendance_summary = row_builder(
+    AttendanceSummary, ("going", "maybe", "drivers", "seats_offered", "remaining")
+)
+
+
+def row_to_event(row):
+    return _build_event(row)
+
+
 def get_event_by_id(db, event_id: int):
-    db.execute(
-        """
-        SELECT id, title, description, start_date, end_date, created_by, location, max_attendees, status
-        FROM events
-        WHERE id = %s;
-        """,
-        (event_id,),
-    )
+    execute_prepared(db, GET_EVENT_BY_ID, (event_id,))
     row = db.fetchone()
     if row is None:
         return None
+    return row_to_event(row)
 
-    (
-        id,
-        title,
-        description,
-        start_date,
-        end_date,
-        created_by,
-        location,
-        max_attendees,
-        status,
-    ) = row
-    return Event(
-        id=id,
-        title=title,
-        description=description,
-        start_datetime=start_date,
-        end_datetime=end_date,
-        created_by=created_by,
-        location=location,
-        max_attendees=max_attendees,
-        status=status,
-    )
+
+# The statement builders below are shared with async_queries.event_queries
+
+EVENT_COLUMNS = "id, title, description, start_date, end_date, created_by, location, max_attendees, status"
+# Counters maintained by the attendances trigger (migration 0008)
+ATTENDANCE_COLUMNS = "going_count, maybe_count, driver_count, seats_offered"
+
+
+def event_columns(include_attendance=False):
+    if include_attendance:
+        return f"{EVENT_COLUMNS}, {ATTENDANCE_COLUMNS}"
+    return EVENT_COLUMNS
 
 
-def get_events_paginated(db, limit, offset, min_capacity=None, search=None):
-    query = """
-        SELECT id, title, description, start_date, end_date, created_by, location, max_attendees, status
+def row_to_listed_event(row, include_attendance=False):
+    if not include_attendance:
+        return _build_event(row[:9])
+
+    max_attendees = row[7]
+    going, maybe, drivers, seats_offered = row[9:13]
+    remaining = None
+    if max_attendees is not None:
+        remaining = max(max_attendees - going, 0)
+    summary = _build_attendance_summary((going, maybe, drivers, seats_offered, remaining))
+    return _build_event_with_attendance(row[:9] + (summary,))
+
+
+# events.search_vector covers title (A), description (B) and location (C) and
+# is GIN indexed (migration 0005). 'simple' skips stemming so prefixes typed
+# into the search box match the way users expect.
+SEARCH_MATCH = " AND search_vector @@ to_tsquery('simple', %s)"
+
+
+def search_tsquery(search):
+    """Turn free text into a prefix tsquery: "maid caf" -> "maid:* & caf:*"."""
+    if not search:
+        return None
+    terms = re.findall(r"[^\W_]+", search.lower())
+    if not terms:
+        return None
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+# Planner row estimate kept fresh by autovacuum/ANALYZE; NULL if never analyzed
+ESTIMATED_EVENT_COUNT = """(
+    SELECT CASE WHEN reltuples >= 0 THEN reltuples::bigint END
+    FROM pg_class WHERE oid = 'events'::regclass
+)"""
+
+
+def uses_estimated_total(min_capacity=None, search=None, approximate_total=False):
+    # The estimate describes the whole table, so filtered lists need an exact count
+    return bool(approximate_total) and not min_capacity and not search_tsquery(search)
+
+
+def events_page_statement(
+    limit, offset, min_capacity=None, search=None, approximate_total=False, include_attendance=False
+):
+    """One page plus the total match count (last column) in the same statement."""
+    approximate = uses_estimated_total(min_capacity, search, approximate_total)
+    total = ESTIMATED_EVENT_COUNT if approximate else "COUNT(*) OVER ()"
+    query = f"""
+        SELECT {event_columns(include_attendance)},
+               {total} AS total
         FROM events
         WHERE 1=1
     """
     params = []
+    search = search_tsquery(search)
 
     if min_capacity:
         query += " AND max_attendees >= %s"
         params.append(min_capacity)
 
     if search:
-        query += " AND (title ILIKE %s OR description ILIKE %s)"
-        params.append(f"%{search}%")
-        params.append(f"%{search}%")
+        # Best matches first when searching
+        query += SEARCH_MATCH
+        query += " ORDER BY ts_rank(search_vector, to_tsquery('simple', %s)) DESC, id"
+        params.extend([search, search])
+    else:
+        query += " ORDER BY id"
 
-    query += " ORDER BY id LIMIT %s OFFSET %s"
+    query += " LIMIT %s OFFSET %s"
     params.extend([limit, offset])
 
-    db.execute(query, params)
-    rows = db.fetchall()
-    if not rows:
-        return []
+    # One prepared variant per combination of optional filters
+    flags = f"{int(bool(min_capacity))}{int(bool(search))}{int(approximate)}{int(include_attendance)}"
+    name = prepare(f"get_events_paginated_{flags}", query)
+    return name, params
 
-    return [
-        Event(
-            id=row[0],
-            title=row[1],
-            description=row[2],
-            start_datetime=row[3],
-            end_datetime=row[4],
-            created_by=row[5],
-            location=row[6],
-            max_attendees=row[7],
-            status=row[8],
-        )
-        for row in rows
-    ]
 
+def total_events_statement(search=None, min_capacity=None, approximate_total=False):
+    approximate = uses_estimated_total(min_capacity, search, approximate_total)
+    if approximate:
+        return prepare("get_total_events_estimate", f"SELECT {ESTIMATED_EVENT_COUNT};"), []
 
-def get_total_events(db, search=None):
     query = "SELECT COUNT(*) FROM events WHERE 1=1"
     params = []
+    search = search_tsquery(search)
 
-    # if min_capacity:
-    #     query += " AND max_attendees >= %s"
-    #     params.append(min_capacity)
+    if min_capacity:
+        query += " AND max_attendees >= %s"
+        params.append(min_capacity)
 
     if search:
-        query += " AND (title ILIKE %s OR description ILIKE %s)"
-        params.append(f"%{search}%")
-        params.append(f"%{search}%")
+        query += SEARCH_MATCH
+        params.append(search)
+
+    name = prepare(f"get_total_events_{int(bool(min_capacity))}{int(bool(search))}", query)
+    return name, params
 
-    db.execute(query, params)
-    return db.fetchone()[0]
+
+# Keyset sort orders: each is backed by an index ending in id so ties are stable
+EVENT_SORTS = {
+    "id": ("id",),
+    "start_date": ("start_date", "id"),
+}
+
+
+def event_sort_key(event: Event, sort):
+    if sort == "start_date":
+        return [event.start_datetime.isoformat(), event.id]
+    return [event.id]
+
+
+def events_keyset_statement(
+    limit, sort="id", after=None, min_capacity=None, search=None, include_attendance=False
+):
+    """Seek past the `after` key instead of OFFSET, so every page costs the same."""
+    columns = EVENT_SORTS[sort]
+    query = f"""
+        SELECT {event_columns(include_attendance)}
+        FROM events
+        WHERE 1=1
+    """
+    params = []
+    search = search_tsquery(search)
+
+    if after:
+        query += f" AND ({', '.join(columns)}) > ({', '.join(['%s'] * len(columns))})"
+        params.extend(after)
+
+    if min_capacity:
+        query += " AND max_attendees >= %s"
+        params.append(min_capacity)
+
+    # Cursor pages keep their sort order; search only filters here
+    if search:
+        query += SEARCH_MATCH
+        params.append(search)
+
+    query += f" ORDER BY {', '.join(columns)} LIMIT %s"
+    params.append(limit)
+
+    flags = f"{int(bool(after))}{int(bool(min_capacity))}{int(bool(search))}{int(include_attendance)}"
+    name = prepare(f"get_events_keyset_{sort}_{flags}", query)
+    return name, params
+
+
+def get_events_paginated(
+    db, limit, offset, min_capacity=None, search=None, approximate_total=False, include_attendance=False
+):
+    """Return (events, total, total_is_estimate) for one offset page in a single
+    round trip. total_is_estimate is False whenever an exact count was used.
+
+    With include_attendance the events carry their attendance counters."""
+    name, params = events_page_statement(
+        limit, offset, min_capacity, search, approximate_total, include_attendance
+    )
+    execute_prepared(db, name, params)
+    rows = db.fetchall()
+    events = [row_to_listed_event(row[:-1], include_attendance) for row in rows]
+
+    if rows and rows[0][-1] is not None:
+        return events, rows[0][-1], uses_estimated_total(min_capacity, search, approximate_total)
+    if not rows and offset == 0:
+        return events, 0, False
+    # Past the last page (no row to carry the count) or table never analyzed
+    total, _ = get_total_events(db, search, min_capacity)
+    return events, total, False
+
+
+def get_total_events(db, search=None, min_capacity=None, approximate_total=False):
+    """Return (total, total_is_estimate); falls back to an exact count when the
+    planner has no estimate yet."""
+    name, params = total_events_statement(search, min_capacity, approximate_total)
+    execute_prepared(db, name, params)
+    total = db.fetchone()[0]
+    if total is None:
+        return get_total_events(db, search, min_capacity)
+    return total, uses_estimated_total(min_capacity, search, approximate_total)
+
+
+def get_events_after(
+    db, limit, sort="id", after=None, min_capacity=None, search=None, include_attendance=False
+):
+    """Return one keyset page plus whether more rows follow it."""
+    name, params = events_keyset_statement(
+        limit + 1, sort, after, min_capacity, search, include_attendance
+    )
+    execute_prepared(db, name, params)
+    events = [row_to_listed_event(row, include_attendance) for row in db.fetchall()]
+    return events[:limit], len(events) > limit
 
 
 def update_event(db, event_id: int, event: EventUpdate):
@@ -173,55 +337,82 @@ def delete_event(db, event_id: int):
     return row[0] if row else None
 
 
-def get_admin_event_info(db, event_id: int):
+def get_admin_event_infos(db, event_ids: list[int]):
+    """Driver/seat totals and attendee lists for many events in one query.
 
-    # First get the event title and aggregates
+    Returns {event_id: AdminEventInfo}; ids that do not exist are left out.
+    """
     db.execute(
         """
-        SELECT 
-            events.title,
-            COUNT(CASE WHEN attendances.role = 'Driver' THEN 1 END) AS driver_count,
-            COALESCE(SUM(attendances.seats_available), 0) AS passenger_count
-        FROM events
-        LEFT JOIN attendances ON events.id = attendances.event_id
-        WHERE events.id = %s
-        GROUP BY events.title;
+        SELECT
+            e.id,
+            e.title,
+            COUNT(*) FILTER (WHERE a.role = 'Driver') AS driver_count,
+            COALESCE(SUM(a.seats_available), 0) AS passenger_count,
+            COALESCE(
+                json_agg(
+                    json_build_object(
+                        'first_name', u.first_name,
+                        'last_name', u.last_name,
+                        'status', a.status,
+                        'role', a.role,
+                        'seats_available', a.seats_available
+                    )
+                    ORDER BY a.id
+                ) FILTER (WHERE a.id IS NOT NULL),
+                '[]'
+            ) AS attendees
+        FROM events e
+        LEFT JOIN attendances a ON a.event_id = e.id
+        LEFT JOIN users u ON u.id = a.user_id
+        WHERE e.id = ANY(%s)
+        GROUP BY e.id;
         """,
-        (event_id,),
+        (list(event_ids),),
     )
-    summary = db.fetchone()
-    if not summary:
-        return None
 
-    # Then get individual attendees
+    return {
+        row[0]: AdminEventInfo(
+            title=row[1],
+            driver_count=row[2],
+            passenger_count=row[3],
+            attendees=row[4],
+        )
+        for row in db.fetchall()
+    }
+
+
+def get_admin_event_info(db, event_id: int):
+    return get_admin_event_infos(db, [event_id]).get(event_id)
+
+
+def get_carpool_attendees(db, event_id: int):
+    """Going drivers and passengers of an event, in sign-up order, as (drivers, passengers)."""
     db.execute(
         """
-        SELECT 
-            users.first_name,
-            users.last_name,
-            attendances.status,
-            attendances.role,
-            attendances.seats_available
-        FROM attendances
-        INNER JOIN users ON attendances.user_id = users.id
-        WHERE attendances.event_id = %s;
+        SELECT a.id, a.user_id, u.first_name, u.last_name, a.role, a.seats_available, a.location_hint
+        FROM attendances a
+        JOIN users u ON u.id = a.user_id
+        WHERE a.event_id = %s
+          AND a.status = 'going'
+          AND a.role IN ('Driver', 'Passenger')
+        ORDER BY a.id;
         """,
         (event_id,),
     )
-    rows = db.fetchall()
 
-    return AdminEventInfo(
-        title=summary[0],
-        driver_count=summary[1],
-        passenger_count=summary[2],
-        attendees=[
-            {
-                "first_name": row[0],
-                "last_name": row[1],
-                "status": row[2],
-                "role": row[3],
-                "seats_available": row[4],
-            }
-            for row in rows
-        ],
-    )
+    drivers, passengers = [], []
+    for row in db.fetchall():
+        attendee = {
+            "attendance_id": row[0],
+            "user_id": row[1],
+            "first_name": row[2],
+            "last_name": row[3],
+            "location_hint": row[6],
+        }
+        if row[4] == "Driver":
+            attendee["seats_available"] = row[5] or 0
+            drivers.append(attendee)
+        else:
+            passengers.append(attendee)
+    return drivers, passengers
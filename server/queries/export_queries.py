@@ -0,0 +1,93 @@
+import os
+
+# Rows pulled from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 2000))
+
+EVENT_ATTENDANCE_COLUMNS = (
+    "event_id",
+    "event_title",
+    "event_start",
+    "attendance_id",
+    "user_id",
+    "first_name",
+    "last_name",
+    "status",
+    "role",
+    "seats_available",
+    "location_hint",
+    "notes",
+)
+
+PRACTICE_ATTENDANCE_COLUMNS = (
+    "practice_session_id",
+    "practice_title",
+    "practice_date",
+    "user_id",
+    "first_name",
+    "last_name",
+    "attended",
+    "late",
+    "notes",
+)
+
+
+def _date_range(column, start, end):
+    # end is inclusive: the whole "to" day is exported
+    clauses, params = [], []
+    if start is not None:
+        clauses.append(f"{column} >= %s")
+        params.append(start)
+    if end is not None:
+        clauses.append(f"{column} < %s::date + 1")
+        params.append(end)
+    return clauses, params
+
+
+def _stream(conn, name, sql, params, batch_size):
+    # A named cursor keeps the result on the server; only one batch is ever
+    # held in Python. It lives until the surrounding transaction ends.
+    with conn.cursor(name=name) as cur:
+        cur.itersize = batch_size
+        cur.execute(sql, params)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                return
+            yield rows
+
+
+def stream_event_attendances(conn, event_id=None, start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+    """Batches of EVENT_ATTENDANCE_COLUMNS rows, ordered by event start then sign-up."""
+    clauses, params = _date_range("e.start_date", start, end)
+    if event_id is not None:
+        clauses.append("e.id = %s")
+        params.append(event_id)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    sql = f"""
+        SELECT e.id, e.title, e.start_date, a.id, a.user_id, u.first_name, u.last_name,
+               a.status, a.role, a.seats_available, a.location_hint, a.notes
+        FROM attendances a
+        JOIN events e ON e.id = a.event_id
+        JOIN users u ON u.id = a.user_id
+        {where}
+        ORDER BY e.start_date, e.id, a.id;
+    """
+    return _stream(conn, "export_event_attendances", sql, params, batch_size)
+
+
+def stream_practice_attendance(conn, start=None, end=None, batch_size=EXPORT_BATCH_SIZE):
+    """Batches of PRACTICE_ATTENDANCE_COLUMNS rows, ordered by practice date then user."""
+    clauses, params = _date_range("s.date", start, end)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    sql = f"""
+        SELECT s.id, s.title, s.date, p.user_id, u.first_name, u.last_name,
+               p.attended, p.late, p.notes
+        FROM practices p
+        JOIN practice_sessions s ON s.id = p.practice_session_id
+        JOIN users u ON u.id = p.user_id
+        {where}
+        ORDER BY s.date, s.id, p.user_id;
+    """
+    return _stream(conn, "export_practice_attendance", sql, params, batch_size)
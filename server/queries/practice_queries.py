@@ -1,20 +1,121 @@
-from models import PracticeSession
+from models import PracticeAttendanceUpdate, PracticeSession, RoutineUpdate
+from prepared import execute_prepared, prepare
+from rows import build_models
 
+GET_PRACTICE_SESSIONS_VERSION = prepare(
+    "get_practice_sessions_version",
+    "SELECT count(*), max(updated_at) FROM practice_sessions;",
+)
 
-def get_all_practice_sessions(db):
-    db.execute(
+
+def get_practice_sessions_version(db):
+    execute_prepared(db, GET_PRACTICE_SESSIONS_VERSION)
+    return db.fetchone()
+
+
+# ── Practice session listing (shared with async_queries.practice_queries) ────
+
+PRACTICE_SESSION_COLUMNS = "id, title, location, date, notes"
+
+# Same keys (sorted) and HTTP-date format the app's encoder produces for
+# PracticeSession, so the Postgres-built document matches the model path
+PRACTICE_SESSION_JSON = """
+    json_build_object(
+        'date', to_char(date AT TIME ZONE 'UTC', 'Dy, DD Mon YYYY HH24:MI:SS "GMT"'),
+        'id', id,
+        'location', location,
+        'notes', notes,
+        'title', title
+    )
+"""
+
+
+def practice_sessions_statement(start=None, end=None, after=None, limit=None, as_json=False):
+    """Sessions from `start` to `end` (dates, both inclusive) in (date, id) order,
+    seeking past the `after` key. Backed by idx_practice_sessions_date_id.
+
+    as_json aggregates the rows into one JSON array (as text) instead.
+    """
+    query = f"SELECT {PRACTICE_SESSION_COLUMNS} FROM practice_sessions WHERE 1=1"
+    params = []
+
+    if start is not None:
+        query += " AND date >= %s"
+        params.append(start)
+    if end is not None:
+        query += " AND date < %s::date + 1"
+        params.append(end)
+    if after:
+        query += " AND (date, id) > (%s, %s)"
+        params.extend(after)
+    query += " ORDER BY date, id"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    if as_json:
+        query = f"""
+            SELECT COALESCE(json_agg({PRACTICE_SESSION_JSON} ORDER BY date, id), '[]')::text
+            FROM ({query}) AS sessions
         """
-    SELECT id, title, location, date, notes FROM practice_sessions
+
+    flags = f"{int(start is not None)}{int(end is not None)}{int(bool(after))}{int(limit is not None)}"
+    name = prepare(f"get_practice_sessions_{'json' if as_json else 'rows'}_{flags}", query)
+    return name, params
+
+
+def practice_session_sort_key(session: PracticeSession):
+    return [session.date.isoformat(), session.id]
+
+
+def get_all_practice_sessions(db, start=None, end=None):
+    name, params = practice_sessions_statement(start, end)
+    execute_prepared(db, name, params)
+    return build_models(PracticeSession, db.description, db.fetchall())
+
+
+def get_practice_sessions_json(db, start=None, end=None):
+    name, params = practice_sessions_statement(start, end, as_json=True)
+    execute_prepared(db, name, params)
+    return db.fetchone()[0]
+
+
+def get_practice_sessions_after(db, limit, after=None, start=None, end=None):
+    """Return one keyset page plus whether more sessions follow it."""
+    name, params = practice_sessions_statement(start, end, after, limit + 1)
+    execute_prepared(db, name, params)
+    sessions = build_models(PracticeSession, db.description, db.fetchall())
+    return sessions[:limit], len(sessions) > limit
+
+
+# JSON counterpart of get_practice_attendance(), built by Postgres (keys sorted)
+GET_PRACTICE_ATTENDANCE_JSON = prepare(
+    "get_practice_attendance_json",
     """
-    )
-    data = db.fetchall()
-    if not data:
-        return []
+    SELECT COALESCE(
+        json_agg(
+            json_build_object(
+                'attended', p.attended,
+                'first_name', u.first_name,
+                'id', p.id,
+                'last_name', u.last_name,
+                'late', p.late,
+                'notes', p.notes,
+                'user_id', p.user_id
+            )
+        ),
+        '[]'
+    )::text
+    FROM practices p
+    JOIN users u ON u.id = p.user_id
+    WHERE p.practice_session_id = %s;
+    """,
+)
 
-    return [
-        PracticeSession(id=id, title=title, location=location, date=date, notes=notes)
-        for (id, title, location, date, notes) in data
-    ]
+
+def get_practice_attendance_json(db, practice_id: int):
+    execute_prepared(db, GET_PRACTICE_ATTENDANCE_JSON, (practice_id,))
+    return db.fetchone()[0]
 
 
 def post_practice_sessions(db, session: PracticeSession):
@@ -40,15 +141,21 @@ def delete_practice_sessions(db, practice_id: int):
 
 
 def add_practice_attendance(db, practice_id: int, attendees: list[int]):
-    for user_id in attendees:
-        db.execute(
-            """
-            INSERT INTO practices (user_id, practice_session_id, attended)
-            VALUES (%s, %s, TRUE)
-            ON CONFLICT (user_id, practice_session_id) DO NOTHING;
-            """,
-            (user_id, practice_id),
-        )
+    """Mark every user in attendees as present in one statement.
+
+    Returns the ids that were inserted; the rest were already recorded.
+    """
+    db.execute(
+        """
+        INSERT INTO practices (user_id, practice_session_id, attended)
+        SELECT DISTINCT user_id, %s, TRUE
+        FROM unnest(%s::int[]) AS user_id
+        ON CONFLICT (user_id, practice_session_id) DO NOTHING
+        RETURNING user_id;
+        """,
+        (practice_id, attendees),
+    )
+    return [row[0] for row in db.fetchall()]
 
 def get_practice_attendance(db, practice_id: int):
     db.execute(
@@ -83,23 +190,53 @@ def get_practice_attendance(db, practice_id: int):
         for row in rows
     ]
 
-def update_practice_attendance(db, updates: list):
-    for record in updates:
-        db.execute(
-            """
-            UPDATE practices
-            SET attended = %s,
-                late = %s,
-                notes = %s
-            WHERE id = %s;
-            """,
-            (
-                record["attended"],
-                record["late"],
-                record.get("notes"),
-                record["id"],
-            ),
+def update_practice_attendance(db, practice_id: int, updates: list[PracticeAttendanceUpdate]):
+    """Apply a batch of attendance edits in one statement.
+
+    Only rows of this practice session are touched. Returns the updated rows,
+    in the order they were given, shaped like get_practice_attendance().
+    """
+    db.execute(
+        """
+        WITH updated AS (
+            UPDATE practices p
+            SET attended = v.attended,
+                late = v.late,
+                notes = v.notes
+            FROM unnest(%s::int[], %s::bool[], %s::bool[], %s::varchar[])
+                    WITH ORDINALITY AS v(id, attended, late, notes, ord),
+                 users u
+            WHERE p.id = v.id
+              AND p.practice_session_id = %s
+              AND u.id = p.user_id
+            RETURNING p.id, p.user_id, u.first_name, u.last_name,
+                      p.attended, p.late, p.notes, v.ord
         )
+        SELECT id, user_id, first_name, last_name, attended, late, notes
+        FROM updated
+        ORDER BY ord;
+        """,
+        (
+            [u.id for u in updates],
+            [u.attended for u in updates],
+            [u.late for u in updates],
+            [u.notes for u in updates],
+            practice_id,
+        ),
+    )
+
+    return [
+        {
+            "id": row[0],
+            "user_id": row[1],
+            "first_name": row[2],
+            "last_name": row[3],
+            "attended": row[4],
+            "late": row[5],
+            "notes": row[6],
+        }
+        for row in db.fetchall()
+    ]
 
 def create_routine(db, name: str, notes: str | None):
     db.execute(
@@ -171,31 +308,25 @@ def remove_routine_from_practice(db, practice_id: int, routine_id: int):
     row = db.fetchone()
     return row[0] if row else None
 
-def update_routines_bulk(db, routines: list[dict]):
-    updated = []
-
-    for r in routines:
-        db.execute(
-            """
-            UPDATE routines
-            SET name = %s,
-                notes = %s
-            WHERE id = %s
-            RETURNING id, name, notes;
-            """,
-            (
-                r["name"],
-                r.get("notes"),
-                r["id"],
-            ),
+def update_routines_bulk(db, routines: list[RoutineUpdate]):
+    db.execute(
+        """
+        WITH updated AS (
+            UPDATE routines r
+            SET name = v.name,
+                notes = v.notes
+            FROM unnest(%s::int[], %s::varchar[], %s::text[])
+                    WITH ORDINALITY AS v(id, name, notes, ord)
+            WHERE r.id = v.id
+            RETURNING r.id, r.name, r.notes, v.ord
         )
+        SELECT id, name, notes FROM updated ORDER BY ord;
+        """,
+        (
+            [r.id for r in routines],
+            [r.name for r in routines],
+            [r.notes for r in routines],
+        ),
+    )
 
-        row = db.fetchone()
-        if row:
-            updated.append({
-                "id": row[0],
-                "name": row[1],
-                "notes": row[2],
-            })
-
-    return updated
\ No newline at end of file
+    return [{"id": row[0], "name": row[1], "notes": row[2]} for row in db.fetchall()]
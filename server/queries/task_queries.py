@@ -1,4 +1,5 @@
 from models import Task
+from rows import build_models
 
 
 def create_task(db, task: Task):
@@ -30,23 +31,7 @@ def get_tasks_for_event(db, event_id: int):
         """,
         (event_id,),
     )
-    rows = db.fetchall()
-    if not rows:
-        return []
-
-    return [
-        Task(
-            id=row[0],
-            title=row[1],
-            description=row[2],
-            assigned_to=row[3],
-            created_by=row[4],
-            due_date=row[5],
-            event_id=row[6],
-            completed=row[7],
-        )
-        for row in rows
-    ]
+    return build_models(Task, db.description, db.fetchall())
 
 
 # TODO: fix this to use dynamic fields like update_event and update_user
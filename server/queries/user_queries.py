@@ -2,6 +2,44 @@ from models import UserBase, UserAuthorization, UserMe, UserUpdate
 
 from psycopg2.extras import Json
 
+from prepared import execute_prepared, prepare
+from rows import build_models
+
+GET_ME = prepare(
+    "get_me",
+    """
+    SELECT id, first_name, last_name, email, username, admin, type, availability
+    FROM users
+    WHERE id = %s;
+    """,
+)
+
+GET_USER_BY_ID = prepare(
+    "get_user_by_id",
+    """
+    SELECT first_name, last_name, email, username
+    FROM users
+    WHERE id = %s;
+    """,
+)
+
+GET_USER_BY_EMAIL = prepare(
+    "get_user_by_email",
+    """
+    SELECT id, first_name, last_name, email, username, password, admin, active, token_version
+    FROM users
+    WHERE email = %s;
+    """,
+)
+
+GET_TOKEN_VERSION = prepare(
+    "get_token_version", "SELECT token_version FROM users WHERE id = %s;"
+)
+
+GET_USERS_VERSION = prepare(
+    "get_users_version", "SELECT count(*), max(updated_at) FROM users;"
+)
+
 
 # TODO: Add logic to check for duplicates before creating a new user
 def create_user(db, user: UserAuthorization):
@@ -25,41 +63,116 @@ def create_user(db, user: UserAuthorization):
     # Do not commit inside queries — only commit in routes to avoid partial writes
 
 
+def get_users_version(db):
+    execute_prepared(db, GET_USERS_VERSION)
+    return db.fetchone()
+
+
 def get_users(db):
     db.execute("""
         SELECT id, first_name, last_name, email, username, admin, type, availability
         FROM users
     """)
+    return build_models(UserMe, db.description, db.fetchall())
+
+
+# Same document as get_users(), built by Postgres. Keys are listed in sorted
+# order to match the app's encoder; the ::text cast stops the driver parsing it.
+GET_USERS_JSON = prepare(
+    "get_users_json",
+    """
+    SELECT COALESCE(
+        json_agg(
+            json_build_object(
+                'admin', admin,
+                'availability', availability,
+                'email', email,
+                'first_name', first_name,
+                'id', id,
+                'last_name', last_name,
+                'type', type,
+                'username', username
+            )
+        ),
+        '[]'
+    )::text
+    FROM users;
+    """,
+)
+
+
+def get_users_json(db):
+    execute_prepared(db, GET_USERS_JSON)
+    return db.fetchone()[0]
+
+
+# ── User directory (GET /users with paging, filters or fields=) ──────────────
+
+USER_FIELDS = ("id", "first_name", "last_name", "email", "username", "admin", "type", "availability")
+
+USER_SORTS = {
+    "id": ("id",),
+    "name": ("last_name", "first_name", "id"),
+}
+
+
+def users_directory_statement(fields, sort="id", after=None, user_type=None, admin=None, limit=None):
+    """A page of the directory; returns (statement name, params, columns).
+
+    Sort columns are always selected so the next cursor can be built, even when
+    fields= leaves them out. Columns follow USER_FIELDS order whatever order
+    fields= lists them in, so each field set maps to one prepared statement.
+    """
+    sort_columns = USER_SORTS[sort]
+    wanted = {"id", *fields, *sort_columns}
+    columns = [column for column in USER_FIELDS if column in wanted]
+    query = f"SELECT {', '.join(columns)} FROM users WHERE 1=1"
+    params = []
+
+    if user_type is not None:
+        query += " AND type = %s"
+        params.append(user_type)
+    if admin is not None:
+        query += " AND admin = %s"
+        params.append(admin)
+    if after:
+        query += f" AND ({', '.join(sort_columns)}) > ({', '.join(['%s'] * len(sort_columns))})"
+        params.extend(after)
+
+    query += f" ORDER BY {', '.join(sort_columns)}"
+    if limit is not None:
+        query += " LIMIT %s"
+        params.append(limit)
+
+    # One prepared variant per sort, column set and combination of filters
+    mask = sum(1 << i for i, column in enumerate(USER_FIELDS) if column in wanted)
+    flags = f"{int(user_type is not None)}{int(admin is not None)}{int(bool(after))}{int(limit is not None)}"
+    name = prepare(f"get_users_directory_{sort}_{mask:02x}_{flags}", query)
+    return name, params, columns
+
+
+def get_users_directory(db, fields, limit=None, sort="id", after=None, user_type=None, admin=None):
+    """Return (users, next_key): dicts with just `fields` (plus id), and the sort
+    key to continue after, or None on the last page (or without a limit)."""
+    name, params, columns = users_directory_statement(
+        fields, sort, after, user_type, admin, None if limit is None else limit + 1
+    )
+    execute_prepared(db, name, params)
+    rows = db.fetchall()
 
-    data = db.fetchall()
-    if not data:
-        return []
-
-    return [
-        UserMe(
-            id=id,
-            first_name=first_name,
-            last_name=last_name,
-            email=email,
-            username=username,
-            admin=admin,
-            type=type,
-            availability=availability
-        )
-        for (id, first_name, last_name, email, username, admin, type, availability) in data
-    ]
+    next_key = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = dict(zip(columns, rows[-1]))
+        next_key = [last[column] for column in USER_SORTS[sort]]
+
+    keep = [i for i, column in enumerate(columns) if column == "id" or column in fields]
+    return [{columns[i]: row[i] for i in keep} for row in rows], next_key
 
 
 # TODO: consider adding isActive in this for future reference
 def get_me(db, user_id: int):
-    db.execute(
-        """
-        SELECT id, first_name, last_name, email, username, admin, type, availability
-        FROM users
-        WHERE id = %s;
-        """,
-        (user_id,),
-    )
+    execute_prepared(db, GET_ME, (user_id,))
     row = db.fetchone()
     if row is None:
         return None
@@ -79,14 +192,7 @@ def get_me(db, user_id: int):
 
 
 def get_user_by_id(db, user_id: int):
-    db.execute(
-        """
-        SELECT first_name, last_name, email, username
-        FROM users
-        WHERE id = %s;
-        """,
-        (user_id,),
-    )
+    execute_prepared(db, GET_USER_BY_ID, (user_id,))
     row = db.fetchone()
     if row is None:
         return None
@@ -98,14 +204,7 @@ def get_user_by_id(db, user_id: int):
 
 
 def get_user_by_email(db, email: str):
-    db.execute(
-        """
-        SELECT id, first_name, last_name, email, username, password, admin, active
-        FROM users
-        WHERE email = %s;
-        """,
-        (email,),
-    )
+    execute_prepared(db, GET_USER_BY_EMAIL, (email,))
     row = db.fetchone()
     if row is None:
         return None
@@ -119,9 +218,20 @@ def get_user_by_email(db, email: str):
         password=row[5],
         admin=row[6],
         active=row[7],
+        token_version=row[8],
     )
 
 
+def get_token_version(db, user_id: int):
+    execute_prepared(db, GET_TOKEN_VERSION, (user_id,))
+    row = db.fetchone()
+    return row[0] if row else None
+
+
+def update_password_hash(db, user_id: int, hashed: str):
+    db.execute("UPDATE users SET password = %s WHERE id = %s;", (hashed, user_id))
+
+
 def update_user(db, user_id: int, user: UserUpdate):
     fields = []
     values = []
@@ -1,4 +1,5 @@
 from flask import Blueprint, request
+from psycopg2 import errors as pg_errors
 from pydantic import ValidationError
 
 from queries.attendance_queries import (
@@ -8,6 +9,7 @@ from queries.attendance_queries import (
     post_attendance,
     update_attendance,
 )
+from cache import invalidate
 from models import NewAttendance, UpdatedAttendance
 from middleware import require_auth
 from utils import APIError, success_response, get_db
@@ -16,13 +18,20 @@ from utils import APIError, success_response, get_db
 attendance_bp = Blueprint("attendances", __name__)
 
 
+def event_full(e):
+    # Raised by the attendances trigger when a write would overbook an event
+    if e.diag.constraint_name == "event_capacity":
+        return APIError("EVENT_FULL", "This event is full", 409)
+    return e
+
+
 @attendance_bp.route("/attendances/me", methods=["GET", "POST"])
 @require_auth
 def my_attendance(user_id):
     with get_db() as (conn, cur):
         if request.method == "GET":
             attendances = get_attendances_by_user(cur, user_id)
-            return success_response([a.model_dump() for a in attendances])
+            return success_response(attendances)
 
         elif request.method == "POST":
             data = request.get_json()
@@ -30,7 +39,16 @@ def my_attendance(user_id):
                 data_post = NewAttendance(**data, user_id=user_id)  # want user_id from token not body
             except ValidationError as e:
                 raise APIError("VALIDATION_ERROR", str(e), 422)
-            new_attendance = post_attendance(cur, data_post)
+            try:
+                new_attendance = post_attendance(cur, data_post)
+            except pg_errors.CheckViolation as e:
+                raise event_full(e)
+            except pg_errors.ForeignKeyViolation:
+                raise APIError("EVENT_NOT_FOUND", f"Event {data_post.event_id} does not exist", 404)
+            if new_attendance is None:
+                raise APIError("ALREADY_SIGNED_UP", "You are already signed up for this event", 409)
+            # The event list embeds attendance counters (?include=attendance)
+            invalidate("events")
             return success_response({"id": new_attendance}, 201)
 
 
@@ -50,13 +68,18 @@ def attendance_detail(user_id, attendance_id):
                 attendance_data = UpdatedAttendance(**data)
             except ValidationError as e:
                 raise APIError("VALIDATION_ERROR", str(e), 422)
-            edited_attendance = update_attendance(cur, attendance_id, attendance_data)
+            try:
+                edited_attendance = update_attendance(cur, attendance_id, attendance_data)
+            except pg_errors.CheckViolation as e:
+                raise event_full(e)
             if edited_attendance is None:
                 raise APIError("ATTENDANCE_NOT_FOUND", f"Attendance {attendance_id} does not exist", 404)
+            invalidate("events")
             return success_response({"updated": edited_attendance}, 200)
 
         elif request.method == "DELETE":
             deleted = delete_attendance(cur, attendance_id)
             if deleted is None:
                 raise APIError("ATTENDANCE_NOT_FOUND", f"Attendance {attendance_id} does not exist", 404)
+            invalidate("events")
             return success_response({"deleted": deleted}, 200)
\ No newline at end of file
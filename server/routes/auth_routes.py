@@ -1,81 +1,90 @@
 from flask import Blueprint, jsonify, request
-import bcrypt
 
-from queries.user_queries import get_me, get_user_by_email
-from auth import create_token
-from middleware import require_auth
-from utils import success_response, APIError, get_db
+from passwords import check_password, hash_password, needs_rehash
+from queries.user_queries import get_user_by_email, update_password_hash
+from auth import create_token, remember_token_version
+from middleware import load_current_user, require_auth
+from utils import release_request_db, success_response, APIError, get_db
 
 auth_bp = Blueprint("auth", __name__)
 
 
 @auth_bp.route("/auth/login", methods=["POST"])
 def login():
-    with get_db() as (conn, cur):
-        data = request.get_json()
-        remember_me = data.get("remember_me")
-        email = data.get("email")
-        password = data.get("password")
+    data = request.get_json()
+    remember_me = data.get("remember_me")
+    email = data.get("email")
+    password = data.get("password")
 
+    with get_db() as (conn, cur):
         user = get_user_by_email(cur, email)
 
-        if not user:
-            raise APIError("INVALID_CREDENTIALS", "Invalid user or password", 401)
-
-        if not bcrypt.checkpw(password.encode(), user.password.encode()):
-            raise APIError("INVALID_CREDENTIALS", "Invalid user or password", 401)
-
-        token = create_token(user.id, remember_me)
-
-        # This is for localstorage
-        return jsonify({
-            "success": True,
-            "data": {
-                "id": user.id,
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "username": user.username,
-                "admin": user.admin,
-                "token": token  # ← return token in body
-            },
-            "error": None,
-        })
-
-        # This is for cookies
-
-        # response = make_response(
-        #         jsonify({
-        #             "success": True,
-        #             "data": {
-        #                 "id": user.id,
-        #                 "email": user.email,
-        #                 "first_name": user.first_name,
-        #                 "last_name": user.last_name,
-        #                 "username": user.username,
-        #                 "admin": user.admin
-        #             },
-        #             "error": None,
-        #         })
-        #     )
-
-        # response.set_cookie(
-        #     "token",
-        #     token,
-        #     httponly=True,
-        #     samesite="None",  # changed from "Lax"
-        #     secure=True,      # changed from False — required when samesite="None"
-        #     path="/",
-        #     max_age=60 * 60 * 24 * 30 if remember_me else 60 * 60 * 24,
-        # )
-        # return response
+    if not user:
+        raise APIError("INVALID_CREDENTIALS", "Invalid user or password", 401)
+
+    # Don't hold a pooled connection for the ~250ms bcrypt takes
+    release_request_db()
+    if not check_password(password, user.password):
+        raise APIError("INVALID_CREDENTIALS", "Invalid user or password", 401)
+
+    # BCRYPT_ROUNDS changed since this hash was made
+    if needs_rehash(user.password):
+        rehashed = hash_password(password)
+        with get_db() as (conn, cur):
+            update_password_hash(cur, user.id, rehashed)
+
+    token = create_token(user.id, remember_me, user.admin, user.token_version)
+    remember_token_version(user.id, user.token_version)
+
+    # This is for localstorage
+    return jsonify({
+        "success": True,
+        "data": {
+            "id": user.id,
+            "email": user.email,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "username": user.username,
+            "admin": user.admin,
+            "token": token  # ← return token in body
+        },
+        "error": None,
+    })
+
+    # This is for cookies
+
+    # response = make_response(
+    #         jsonify({
+    #             "success": True,
+    #             "data": {
+    #                 "id": user.id,
+    #                 "email": user.email,
+    #                 "first_name": user.first_name,
+    #                 "last_name": user.last_name,
+    #                 "username": user.username,
+    #                 "admin": user.admin
+    #             },
+    #             "error": None,
+    #         })
+    #     )
+
+    # response.set_cookie(
+    #     "token",
+    #     token,
+    #     httponly=True,
+    #     samesite="None",  # changed from "Lax"
+    #     secure=True,      # changed from False — required when samesite="None"
+    #     path="/",
+    #     max_age=60 * 60 * 24 * 30 if remember_me else 60 * 60 * 24,
+    # )
+    # return response
 
 
 @auth_bp.route("/auth/me", methods=["GET"])
 @require_auth
 def get_current_user(user_id):
     with get_db() as (conn, cur):
-        user = get_me(cur, user_id)
+        user = load_current_user(cur, user_id)
         return success_response(user.model_dump())
 
 
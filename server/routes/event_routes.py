@@ -1,33 +1,127 @@
+from datetime import datetime
+
 from flask import Blueprint, request
 from pydantic import ValidationError
 from models import Event, EventUpdate
 from queries.event_queries import (
+    EVENT_SORTS,
+    event_sort_key,
     get_admin_event_info,
+    get_admin_event_infos,
+    get_carpool_attendees,
     get_event_by_id,
+    get_events_after,
     get_events_paginated,
+    get_events_version,
     get_total_events,
     create_event,
     update_event,
     delete_event,
 )
-from middleware import require_admin, require_auth
-from queries.user_queries import get_me
-from utils import success_response, APIError, get_db
+from middleware import load_current_user, require_admin, require_auth
+from cache import cached, invalidate
+from carpool import match_carpools
+from utils import (
+    decode_cursor,
+    encode_cursor,
+    not_modified,
+    parse_quantity,
+    request_url,
+    success_response,
+    version_etag,
+    APIError,
+    get_db,
+)
 
 event_bp = Blueprint("events", __name__)
 
 
+# Largest ?quantity= for one cursor page of events
+MAX_EVENTS_PAGE = 100
+
+
+def parse_event_cursor(after, sort):
+    """Validate an ?after= cursor; an empty value means the first page."""
+    if sort not in EVENT_SORTS:
+        raise APIError("VALIDATION_ERROR", f"sort must be one of {', '.join(EVENT_SORTS)}", 422)
+    if not after:
+        return None
+
+    key = decode_cursor(after, f"events:{sort}")
+    try:
+        if sort == "start_date":
+            start_date, event_id = key
+            return [datetime.fromisoformat(start_date), int(event_id)]
+        (event_id,) = key
+        return [int(event_id)]
+    except (TypeError, ValueError):
+        raise APIError("INVALID_CURSOR", "Invalid or expired cursor", 400)
+
+
+def next_event_cursor(events, has_more, sort):
+    if not has_more:
+        return None
+    return encode_cursor(f"events:{sort}", event_sort_key(events[-1], sort))
+
+
+def includes(value, name):
+    """?include=attendance,other -> True for "attendance"."""
+    return name in (value or "").split(",")
+
+
+def get_events_by_cursor(cur, etag=None):
+    """Cursor mode for GET /events (?after=<cursor>, empty for the first page)."""
+    quantity = parse_quantity(request.args.get("quantity", 10), MAX_EVENTS_PAGE)
+    sort = request.args.get("sort", "id")
+    after = parse_event_cursor(request.args.get("after"), sort)
+    min_capacity = request.args.get("min_capacity")
+    search = request.args.get("search_term")
+    include_attendance = includes(request.args.get("include"), "attendance")
+
+    events, has_more = get_events_after(
+        cur, quantity, sort, after, min_capacity, search, include_attendance
+    )
+
+    data = {
+        "quantity": quantity,
+        "count": len(events),
+        "events": events,
+        "next_cursor": next_event_cursor(events, has_more, sort),
+    }
+    # Counting scans every matching row, so only do it when asked
+    if request.args.get("include_total") == "true":
+        approximate_total = request.args.get("approximate_total") == "true"
+        data["total"], data["total_is_estimate"] = get_total_events(
+            cur, search, min_capacity, approximate_total
+        )
+    return success_response(data, 200, etag=etag)
+
+
 @event_bp.route("/events", methods=["GET"])
+@cached("events")
 def get_events():
-    with get_db() as (conn, cur):
+    with get_db(readonly=True) as (conn, cur):
+        # Answer polls of an unchanged list before touching the rows
+        etag = version_etag(request_url(), get_events_version(cur))
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
+        if request.args.get("after") is not None:
+            return get_events_by_cursor(cur, etag)
+
         page = int(request.args.get("page", 1))
         quantity = int(request.args.get("quantity", 10))
         offset = (page - 1) * quantity
         min_capacity = request.args.get("min_capacity")
         search = request.args.get("search_term")
+        # Use the planner's row estimate instead of counting (unfiltered lists only)
+        approximate_total = request.args.get("approximate_total") == "true"
+        include_attendance = includes(request.args.get("include"), "attendance")
 
-        events = get_events_paginated(cur, quantity, offset, min_capacity, search)
-        total = get_total_events(cur, search)
+        events, total, total_is_estimate = get_events_paginated(
+            cur, quantity, offset, min_capacity, search, approximate_total, include_attendance
+        )
 
         return success_response(
             {
@@ -35,9 +129,11 @@ def get_events():
                 "quantity": quantity,
                 "count": len(events),
                 "total": total,
-                "events": [event.model_dump() for event in events],
+                "total_is_estimate": total_is_estimate,
+                "events": events,
             },
             200,
+            etag=etag,
         )
 
 
@@ -51,18 +147,56 @@ def create_event_route(user_id):
         except ValidationError as e:
             raise APIError("VALIDATION_ERROR", str(e), 422)
         event_id = create_event(cur, posted_event)
+        invalidate("events")
         return success_response({"id": event_id}, 201)
 
 
 @event_bp.route("/events/<int:event_id>", methods=["GET"])
+@cached("event:{event_id}")
 def get_event(event_id):
-    with get_db() as (conn, cur):
+    with get_db(readonly=True) as (conn, cur):
         event = get_event_by_id(cur, event_id)
         if event is None:
             raise APIError("EVENT_NOT_FOUND", f"Event {event_id} does not exist", 404)
         return success_response(event.model_dump(), 200)
 
 
+# Upper bound for one /events/admin_info call; a page of event cards fits easily
+MAX_ADMIN_INFO_IDS = 100
+
+
+def parse_event_ids(value):
+    """?ids=1,2,3 -> [1, 2, 3], first occurrence of each id kept, in order."""
+    try:
+        event_ids = list(dict.fromkeys(int(i) for i in (value or "").split(",") if i.strip()))
+    except ValueError:
+        raise APIError("VALIDATION_ERROR", "ids must be a comma-separated list of event ids", 422)
+    if not event_ids:
+        raise APIError("VALIDATION_ERROR", "ids is required", 422)
+    if len(event_ids) > MAX_ADMIN_INFO_IDS:
+        raise APIError("VALIDATION_ERROR", f"At most {MAX_ADMIN_INFO_IDS} ids per request", 422)
+    return event_ids
+
+
+def admin_infos_in_order(event_ids, infos):
+    """The infos in the order the ids were asked for; unknown ids are left out."""
+    return [
+        {"id": event_id, **infos[event_id].model_dump()}
+        for event_id in event_ids
+        if event_id in infos
+    ]
+
+
+@event_bp.route("/events/admin_info", methods=["GET"])
+@require_admin
+def get_admin_event_infos_route(user_id):
+    """Admin info for several events (?ids=1,2,3) in one query, in the order asked."""
+    event_ids = parse_event_ids(request.args.get("ids"))
+    with get_db() as (conn, cur):
+        infos = get_admin_event_infos(cur, event_ids)
+    return success_response(admin_infos_in_order(event_ids, infos), 200)
+
+
 @event_bp.route("/events/<int:event_id>/admin_info", methods=["GET"])
 @require_admin
 def get_admin_event_info_route(event_id, user_id):
@@ -77,11 +211,22 @@ def get_admin_event_info_route(event_id, user_id):
         return success_response(event_info.model_dump(), 200)
 
 
+@event_bp.route("/events/<int:event_id>/carpool", methods=["GET"])
+@require_admin
+def get_event_carpool(event_id, user_id):
+    """Suggested passenger-to-driver assignment for an event; nothing is saved."""
+    with get_db(readonly=True) as (conn, cur):
+        if get_event_by_id(cur, event_id) is None:
+            raise APIError("EVENT_NOT_FOUND", f"Event {event_id} does not exist", 404)
+        drivers, passengers = get_carpool_attendees(cur, event_id)
+    return success_response({"event_id": event_id, **match_carpools(drivers, passengers)}, 200)
+
+
 @event_bp.route("/events/<int:event_id>", methods=["PATCH", "DELETE"])
 @require_auth
 def event_detail(event_id, user_id):
     with get_db() as (conn, cur):
-        current_user = get_me(cur, user_id)
+        current_user = load_current_user(cur, user_id)
         event = get_event_by_id(cur, event_id)
         if event is None:
             raise APIError("EVENT_NOT_FOUND", f"Event {event_id} does not exist", 404)
@@ -95,10 +240,12 @@ def event_detail(event_id, user_id):
             except ValidationError as e:
                 raise APIError("VALIDATION_ERROR", str(e), 422)
             updated_id = update_event(cur, event_id, updated_event)
+            invalidate("events", f"event:{event_id}")
             return success_response({"id": updated_id}, 200)
 
         elif request.method == "DELETE":
             deleted_id = delete_event(cur, event_id)
             if deleted_id is None:
                 raise APIError("EVENT_NOT_FOUND", f"Event {event_id} does not exist", 404)
+            invalidate("events", f"event:{event_id}")
             return success_response({"deleted": deleted_id}, 200)
\ No newline at end of file
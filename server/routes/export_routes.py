@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from flask import Blueprint, Response, request, stream_with_context
+
+from middleware import require_admin
+from queries.export_queries import (
+    EVENT_ATTENDANCE_COLUMNS,
+    PRACTICE_ATTENDANCE_COLUMNS,
+    stream_event_attendances,
+    stream_practice_attendance,
+)
+from utils import APIError, get_db
+
+export_bp = Blueprint("exports", __name__)
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+# ── Encoders ──────────────────────────────────────────────────────────────────
+
+
+def _export_value(value):
+    # Exports are read by spreadsheets and scripts, so dates are ISO 8601
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def csv_chunks(columns, batches):
+    """One CSV chunk for the header, then one per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield buffer.getvalue()
+
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_export_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(columns, batches):
+    for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=_export_value, separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+
+# ── Routes ────────────────────────────────────────────────────────────────────
+
+
+def parse_export_args():
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        raise APIError("VALIDATION_ERROR", f"format must be one of {', '.join(EXPORT_FORMATS)}", 422)
+    try:
+        start, end = (
+            date.fromisoformat(request.args[name]) if request.args.get(name) else None
+            for name in ("from", "to")
+        )
+    except ValueError:
+        raise APIError("VALIDATION_ERROR", "from and to must be dates (YYYY-MM-DD)", 422)
+    return fmt, start, end
+
+
+def parse_event_id(value):
+    """Optional ?event_id=; anything but a positive integer is rejected rather
+    than silently exporting every event."""
+    if not value:
+        return None
+    try:
+        event_id = int(value)
+    except ValueError:
+        event_id = 0
+    if event_id < 1:
+        raise APIError("VALIDATION_ERROR", "event_id must be a positive integer", 422)
+    return event_id
+
+
+def streamed_export(filename, fmt, columns, open_batches):
+    """Stream an export; open_batches(conn) is only called once the body is read,
+    so nothing is queried or buffered before the first bytes go out."""
+
+    def generate():
+        with get_db(readonly=True) as (conn, cur):
+            batches = open_batches(conn)
+            encode = csv_chunks if fmt == "csv" else ndjson_chunks
+            yield from encode(columns, batches)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'},
+    )
+
+
+@export_bp.route("/exports/event-attendances", methods=["GET"])
+@require_admin
+def export_event_attendances(user_id):
+    """?format=csv|ndjson&event_id=&from=YYYY-MM-DD&to=YYYY-MM-DD (by event start)."""
+    fmt, start, end = parse_export_args()
+    event_id = parse_event_id(request.args.get("event_id"))
+    return streamed_export(
+        "event-attendances",
+        fmt,
+        EVENT_ATTENDANCE_COLUMNS,
+        lambda conn: stream_event_attendances(conn, event_id, start, end),
+    )
+
+
+@export_bp.route("/exports/practice-attendance", methods=["GET"])
+@require_admin
+def export_practice_attendance(user_id):
+    """?format=csv|ndjson&from=YYYY-MM-DD&to=YYYY-MM-DD (by practice date)."""
+    fmt, start, end = parse_export_args()
+    return streamed_export(
+        "practice-attendance",
+        fmt,
+        PRACTICE_ATTENDANCE_COLUMNS,
+        lambda conn: stream_practice_attendance(conn, start, end),
+    )
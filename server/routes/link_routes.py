@@ -1,17 +1,19 @@
 from flask import Blueprint, request
 
+from cache import cached, invalidate
 from queries.link_queries import create_link, get_links_by_category, update_link
-from utils import get_db, success_response
+from utils import APIError, get_db, success_response
 
 
 link_bp = Blueprint("links", __name__)
 
 @link_bp.route("/links", methods=["GET"])
+@cached("links", "links:{category}")
 def get_links():
-    with get_db() as (conn, cur):
+    with get_db(readonly=True) as (conn, cur):
         category = request.args.get("category")
         data = get_links_by_category(cur, category)
-        return success_response(data, 201)
+        return success_response(data, 200)
 
 
 @link_bp.route("/links", methods=["POST"])
@@ -25,8 +27,9 @@ def create_link_route():
 
         new_link = create_link(cur, category, link_url, title)
         conn.commit()
+        invalidate(f"links:{category}")
 
-        return {"data": new_link, "success": True, "error": None}, 201
+        return success_response(new_link, 201)
 
 
 @link_bp.route("/links/<int:link_id>", methods=["PUT"])
@@ -41,8 +44,10 @@ def update_link_route(link_id):
         updated_link = update_link(cur, link_id, category, link_url, title)
 
         if not updated_link:
-            return {"data": None, "success": False, "error": "Link not found"}, 404
+            raise APIError("LINK_NOT_FOUND", f"Link {link_id} does not exist", 404)
 
         conn.commit()
+        # The link may have moved between categories, so drop every list
+        invalidate("links")
 
-        return {"data": updated_link, "success": True, "error": None}
\ No newline at end of file
+        return success_response(updated_link, 200)
\ No newline at end of file
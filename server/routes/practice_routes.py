@@ -1,4 +1,7 @@
+from datetime import date, datetime
+
 from flask import Blueprint, request
+from psycopg2 import errors as pg_errors
 from pydantic import ValidationError
 
 from middleware import require_admin, require_auth
@@ -9,6 +12,11 @@ from queries.practice_queries import (
     delete_practice_sessions,
     get_all_practice_sessions,
     get_practice_attendance,
+    get_practice_attendance_json,
+    get_practice_sessions_after,
+    get_practice_sessions_json,
+    get_practice_sessions_version,
+    practice_session_sort_key,
     get_routines_by_practice,
     post_practice_sessions,
     remove_routine_from_practice,
@@ -16,20 +24,123 @@ from queries.practice_queries import (
     update_routine,
     update_routines_bulk,
 )
-from models import PracticeSession
-from utils import APIError, get_db, success_response
+from json_provider import DB_JSON_RESPONSES, RawJSON
+from models import PracticeAttendanceUpdate, PracticeSession, RoutineUpdate
+from utils import (
+    APIError,
+    decode_cursor,
+    encode_cursor,
+    get_db,
+    not_modified,
+    parse_quantity,
+    request_url,
+    success_response,
+    version_etag,
+)
 
 practice_bp = Blueprint("practice", __name__)
 
 
+def parse_batch(model, records, label):
+    """Validate a whole bulk payload before any of it is written."""
+    if not isinstance(records, list):
+        raise APIError("VALIDATION_ERROR", f"{label} must be a list", 422)
+    try:
+        batch = [model(**record) for record in records]
+    except (TypeError, ValidationError) as e:
+        raise APIError("VALIDATION_ERROR", str(e), 422)
+
+    ids = [item.id for item in batch]
+    if len(ids) != len(set(ids)):
+        raise APIError("VALIDATION_ERROR", f"{label} contain duplicate ids", 422)
+    return batch
+
+
+def parse_attendees(attendees):
+    """A list of user ids; bools and numeric strings are not ids."""
+    if not isinstance(attendees, list):
+        raise APIError("VALIDATION_ERROR", "Attendees must be a list", 422)
+    if not all(type(a) is int for a in attendees):
+        raise APIError("VALIDATION_ERROR", "Attendees must be user ids", 422)
+    return attendees
+
+
+def attendance_counts(attendees, inserted):
+    """Repeated ids count once; ids not inserted were already recorded."""
+    return {
+        "count": len(attendees),
+        "inserted": len(inserted),
+        "already_present": len(set(attendees)) - len(inserted),
+    }
+
+
+# Largest ?quantity= for one page of practice sessions
+MAX_PRACTICE_PAGE = 200
+
+
+def parse_practice_range(start, end):
+    """?from= / ?to= dates, both inclusive. Without ?from= only sessions from
+    today on are listed, so the default view does not grow with history."""
+    try:
+        start = date.fromisoformat(start) if start else date.today()
+        end = date.fromisoformat(end) if end else None
+    except ValueError:
+        raise APIError("VALIDATION_ERROR", "from and to must be dates (YYYY-MM-DD)", 422)
+    if end is not None and end < start:
+        raise APIError("VALIDATION_ERROR", "to must not be before from", 422)
+    return start, end
+
+
+def parse_practice_cursor(after):
+    """Validate an ?after= cursor; an empty value means the first page."""
+    if not after:
+        return None
+    key = decode_cursor(after, "practice-sessions")
+    try:
+        session_date, session_id = key
+        return [datetime.fromisoformat(session_date), int(session_id)]
+    except (TypeError, ValueError):
+        raise APIError("INVALID_CURSOR", "Invalid or expired cursor", 400)
+
+
+def next_practice_cursor(sessions, has_more):
+    if not has_more:
+        return None
+    return encode_cursor("practice-sessions", practice_session_sort_key(sessions[-1]))
+
+
 # TODO: add validation errors
 @practice_bp.route("/practice-sessions", methods=["GET"])
 @require_auth
 def get_practices(user_id):
-    with get_db() as (conn, cur):
-        data = get_all_practice_sessions(cur)
-        print([d.model_dump() for d in data])
-        return success_response([d.model_dump() for d in data], 200)
+    """Upcoming sessions in date order, or ?from=&to=. ?after= (empty for the
+    first page) switches to keyset pages of ?quantity=."""
+    start, end = parse_practice_range(request.args.get("from"), request.args.get("to"))
+    paged = "after" in request.args
+
+    with get_db(readonly=True) as (conn, cur):
+        # The default range moves with the date, so it is part of the version
+        version = [*get_practice_sessions_version(cur), start]
+        etag = version_etag(request_url(), version)
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
+        if paged:
+            quantity = parse_quantity(request.args.get("quantity", 50), MAX_PRACTICE_PAGE)
+            after = parse_practice_cursor(request.args.get("after"))
+            sessions, has_more = get_practice_sessions_after(cur, quantity, after, start, end)
+            data = {
+                "quantity": quantity,
+                "count": len(sessions),
+                "sessions": sessions,
+                "next_cursor": next_practice_cursor(sessions, has_more),
+            }
+        elif DB_JSON_RESPONSES:
+            data = RawJSON(get_practice_sessions_json(cur, start, end))
+        else:
+            data = get_all_practice_sessions(cur, start, end)
+        return success_response(data, 200, etag=etag)
 
 
 @practice_bp.route("/practice-sessions", methods=["POST"])
@@ -61,41 +172,40 @@ def delete_practice(user_id, practice_id):
 @require_admin
 def add_attendance(user_id, practice_id):
     data = request.get_json()
-    attendees = data.get("attendees", [])
+    attendees = parse_attendees(data.get("attendees", []))
 
-    if not isinstance(attendees, list):
-        raise APIError("VALIDATION_ERROR", "Attendees must be a list", 422)
+    try:
+        with get_db() as (conn, cur):
+            inserted = add_practice_attendance(cur, practice_id, attendees)
+    except pg_errors.ForeignKeyViolation:
+        raise APIError(
+            "NOT_FOUND", "Practice session or one of the users does not exist", 404
+        )
 
-    with get_db() as (conn, cur):
-        try:
-            add_practice_attendance(cur, practice_id, attendees)
-            return success_response(
-                {"message": "Attendance recorded", "count": len(attendees)}, 201
-            )
-        except Exception as e:
-            print("Error:", e)
-            raise APIError("DB_ERROR", "Failed to record attendance", 500)
+    return success_response(
+        {"message": "Attendance recorded", **attendance_counts(attendees, inserted)}, 201
+    )
 
 
 @practice_bp.route("/practice-sessions/<int:practice_id>/attendance", methods=["GET"])
 @require_auth
 def get_attendance(user_id, practice_id):
-    with get_db() as (conn, cur):
-        data = get_practice_attendance(cur, practice_id)
+    with get_db(readonly=True) as (conn, cur):
+        if DB_JSON_RESPONSES:
+            data = RawJSON(get_practice_attendance_json(cur, practice_id))
+        else:
+            data = get_practice_attendance(cur, practice_id)
         return success_response(data, 200)
 
 @practice_bp.route("/practice-sessions/<int:practice_id>/attendance", methods=["PATCH"])
 @require_admin
 def edit_attendance(user_id, practice_id):
     data = request.get_json()
-    updates = data.get("updates", [])
-
-    if not isinstance(updates, list):
-        raise APIError("VALIDATION_ERROR", "Invalid updates format", 422)
+    updates = parse_batch(PracticeAttendanceUpdate, data.get("updates", []), "Updates")
 
     with get_db() as (conn, cur):
-        update_practice_attendance(cur, updates)
-        return success_response({"updated": len(updates)}, 200)
+        updated = update_practice_attendance(cur, practice_id, updates)
+        return success_response(updated, 200)
 
 @practice_bp.route("/practice-sessions/<int:practice_id>/routines", methods=["POST"])
 @require_admin
@@ -117,7 +227,7 @@ def add_routine(user_id, practice_id):
 @practice_bp.route("/practice-sessions/<int:practice_id>/routines", methods=["GET"])
 @require_auth
 def get_routines(user_id, practice_id):
-    with get_db() as (conn, cur):
+    with get_db(readonly=True) as (conn, cur):
         data = get_routines_by_practice(cur, practice_id)
         return success_response(data, 200)
 
@@ -155,11 +265,7 @@ def delete_routine_from_practice(user_id, practice_id, routine_id):
 @require_admin
 def edit_routines_bulk(user_id):
     data = request.get_json()
-
-    routines = data.get("routines", [])
-
-    if not isinstance(routines, list):
-        raise APIError("VALIDATION_ERROR", "Routines must be a list", 422)
+    routines = parse_batch(RoutineUpdate, data.get("routines", []), "Routines")
 
     with get_db() as (conn, cur):
         updated = update_routines_bulk(cur, routines)
@@ -1,66 +1,162 @@
 from flask import Blueprint, request
-import bcrypt
 from psycopg2 import errors as pg_errors
 from pydantic import ValidationError
 from models import UserRegister, UserAuthorization, UserUpdate
 from queries.invite_queries import validate_invite, use_invite
 from datetime import datetime
 from queries.user_queries import (
-    get_me,
     get_user_by_email,
     get_user_by_id,
     create_user,
+    USER_FIELDS,
+    USER_SORTS,
     get_users,
+    get_users_directory,
+    get_users_json,
+    get_users_version,
     update_user,
     delete_user,
 )
-from middleware import require_admin, require_auth
-from utils import success_response, APIError, get_db
+from auth import forget_token_version
+from middleware import load_current_user, require_admin, require_auth
+from cache import cached, invalidate
+from json_provider import DB_JSON_RESPONSES, RawJSON
+from passwords import check_password, hash_password
+from utils import (
+    decode_cursor,
+    encode_cursor,
+    not_modified,
+    parse_quantity,
+    release_request_db,
+    request_url,
+    success_response,
+    version_etag,
+    APIError,
+    get_db,
+)
 
 user_bp = Blueprint("users", __name__)
 
 
+# Largest ?quantity= for one page of the user directory
+MAX_USERS_PAGE = 200
+USER_TYPES = ("maid", "butler")
+
+
+def parse_user_fields(value):
+    """?fields=first_name,last_name -> ("first_name", "last_name"); id is always sent."""
+    if not value:
+        return USER_FIELDS
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    unknown = [f for f in fields if f not in USER_FIELDS]
+    if unknown:
+        raise APIError(
+            "VALIDATION_ERROR", f"Unknown field(s) {', '.join(unknown)}; use {', '.join(USER_FIELDS)}", 422
+        )
+    return fields
+
+
+def parse_user_cursor(after, sort):
+    if not after:
+        return None
+    key = decode_cursor(after, f"users:{sort}")
+    try:
+        if sort == "name":
+            last_name, first_name, target_id = key
+            return [str(last_name), str(first_name), int(target_id)]
+        (target_id,) = key
+        return [int(target_id)]
+    except (TypeError, ValueError):
+        raise APIError("INVALID_CURSOR", "Invalid or expired cursor", 400)
+
+
+def parse_user_filters():
+    user_type = request.args.get("type")
+    if user_type is not None and user_type not in USER_TYPES:
+        raise APIError("VALIDATION_ERROR", f"type must be one of {', '.join(USER_TYPES)}", 422)
+    admin = request.args.get("admin")
+    if admin not in (None, "true", "false"):
+        raise APIError("VALIDATION_ERROR", "admin must be true or false", 422)
+    return user_type, None if admin is None else admin == "true"
+
+
 # TODO: add validation errors
 @user_bp.route("/users", methods=["GET"])
 @require_admin
 def get_all_users(user_id):
+    """Every user by default. ?after= (empty for the first page) switches to keyset
+    pages of ?quantity=; ?sort=id|name, ?type=, ?admin= and ?fields= apply to both."""
+    fields = parse_user_fields(request.args.get("fields"))
+    sort = request.args.get("sort", "id")
+    if sort not in USER_SORTS:
+        raise APIError("VALIDATION_ERROR", f"sort must be one of {', '.join(USER_SORTS)}", 422)
+    user_type, admin = parse_user_filters()
+    paged = "after" in request.args
+    directory = paged or any(name in request.args for name in ("fields", "sort", "type", "admin"))
+
     with get_db() as (conn, cur):
-        data = get_users(cur)
-        return success_response([u.model_dump() for u in data], 200)
+        etag = version_etag(request_url(), get_users_version(cur))
+        unchanged = not_modified(etag)
+        if unchanged is not None:
+            return unchanged
+
+        if not directory:
+            if DB_JSON_RESPONSES:
+                data = RawJSON(get_users_json(cur))
+            else:
+                data = get_users(cur)
+            return success_response(data, 200, etag=etag)
+
+        if not paged:
+            users, _ = get_users_directory(cur, fields, None, sort, None, user_type, admin)
+            return success_response(users, 200, etag=etag)
+
+        quantity = parse_quantity(request.args.get("quantity", 50), MAX_USERS_PAGE)
+        after = parse_user_cursor(request.args.get("after"), sort)
+        users, next_key = get_users_directory(cur, fields, quantity, sort, after, user_type, admin)
+        data = {
+            "quantity": quantity,
+            "count": len(users),
+            "users": users,
+            "next_cursor": encode_cursor(f"users:{sort}", next_key) if next_key else None,
+        }
+        return success_response(data, 200, etag=etag)
 
 
 @user_bp.route("/users", methods=["POST"])
 def create_new_user():
     try:
-        with get_db() as (conn, cur):
-            data = request.get_json()
+        data = request.get_json()
 
-            invite_code = data.get("invite_code")
-            if not invite_code:
-                raise APIError("INVITE_REQUIRED", "Invite code is required", 400)
+        invite_code = data.get("invite_code")
+        if not invite_code:
+            raise APIError("INVITE_REQUIRED", "Invite code is required", 400)
 
+        with get_db() as (conn, cur):
             invite = validate_invite(cur, invite_code)
-            if not invite:
-                raise APIError("INVALID_INVITE", "Invalid or expired invite code", 400)
-
-            try:  # ← wrap just the validation
-                reg_data = UserRegister(**data)
-            except ValidationError as e:
-                raise APIError("VALIDATION_ERROR", str(e), 422)
-
-            new_user_data = UserAuthorization(
-                first_name=reg_data.first_name,
-                last_name=reg_data.last_name,
-                email=reg_data.email,
-                username=reg_data.username,
-                password=reg_data.password,
-                admin=False,
-                active=True,
-            )
-            hashed_pw = bcrypt.hashpw(
-                new_user_data.password.encode("utf-8"), bcrypt.gensalt()
-            )
-            new_user_data.password = hashed_pw.decode("utf-8")
+        if not invite:
+            raise APIError("INVALID_INVITE", "Invalid or expired invite code", 400)
+
+        try:  # ← wrap just the validation
+            reg_data = UserRegister(**data)
+        except ValidationError as e:
+            raise APIError("VALIDATION_ERROR", str(e), 422)
+
+        new_user_data = UserAuthorization(
+            first_name=reg_data.first_name,
+            last_name=reg_data.last_name,
+            email=reg_data.email,
+            username=reg_data.username,
+            password=reg_data.password,
+            admin=False,
+            active=True,
+        )
+        # Hash with the connection back in the pool; use_invite() below
+        # still catches an invite spent in the meantime
+        release_request_db()
+        new_user_data.password = hash_password(new_user_data.password)
+
+        with get_db() as (conn, cur):
             new_user_id = create_user(cur, new_user_data)
             used = use_invite(cur, invite_code)
             if not used:
@@ -76,8 +172,9 @@ def create_new_user():
 
 
 @user_bp.route("/users/<int:target_user_id>", methods=["GET"])
+@cached("user:{target_user_id}")
 def user_get(target_user_id):
-    with get_db() as (conn, cur):
+    with get_db(readonly=True) as (conn, cur):
         user = get_user_by_id(cur, target_user_id)
         if user is None:
             raise APIError(
@@ -90,32 +187,22 @@ def user_get(target_user_id):
 @require_auth
 def user_detail(user_id, target_user_id):
     with get_db() as (conn, cur):
-        current_user = get_me(cur, user_id)
+        current_user = load_current_user(cur, user_id)
         if user_id != target_user_id and not current_user.admin:
             raise APIError("FORBIDDEN", "Not authorized", 403)
 
         if request.method == "PATCH":
             data = request.get_json()
+            # current_password is only for verification, not a column
+            current_password = data.pop("current_password", None)
             user_data = UserUpdate(**data)
 
-            if user_data.password is not None:
-                current_password = data.get("current_password")
-                if not current_password:
-                    raise APIError("BAD_REQUEST", "Current password required", 400)
-
-                full_user = get_user_by_email(cur, current_user.email)
-                if not bcrypt.checkpw(
-                    current_password.encode(), full_user.password.encode()
-                ):
-                    raise APIError("FORBIDDEN", "Current password is incorrect", 403)
+            if user_data.password is None:
+                return save_user_update(cur, target_user_id, user_data)
 
-                hashed_pw = bcrypt.hashpw(
-                    user_data.password.encode("utf-8"), bcrypt.gensalt()
-                )
-                user_data.password = hashed_pw.decode("utf-8")
-
-            updated_user = update_user(cur, target_user_id, user_data)
-            return success_response({"updated": updated_user}, 200)
+            if not current_password:
+                raise APIError("BAD_REQUEST", "Current password required", 400)
+            full_user = get_user_by_email(cur, current_user.email)
 
         elif request.method == "DELETE":
             deleted_user = delete_user(cur, target_user_id)
@@ -123,4 +210,22 @@ def user_detail(user_id, target_user_id):
                 raise APIError(
                     "USER_NOT_FOUND", f"User {target_user_id} does not exist", 404
                 )
+            invalidate(f"user:{target_user_id}")
+            forget_token_version(target_user_id)
             return success_response({"deleted": deleted_user}, 200)
+
+    # Password change: verify and hash with the connection back in the pool
+    release_request_db()
+    if not check_password(current_password, full_user.password):
+        raise APIError("FORBIDDEN", "Current password is incorrect", 403)
+    user_data.password = hash_password(user_data.password)
+
+    with get_db() as (conn, cur):
+        return save_user_update(cur, target_user_id, user_data)
+
+
+def save_user_update(cur, target_user_id, user_data):
+    updated_user = update_user(cur, target_user_id, user_data)
+    invalidate(f"user:{target_user_id}")
+    forget_token_version(target_user_id)
+    return success_response({"updated": updated_user}, 200)
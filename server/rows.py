@@ -0,0 +1,57 @@
+"""Build read models straight from query rows.
+
+Values coming back from Postgres already have the types the models declare,
+so read paths skip pydantic validation and set the fields directly, the way
+model_construct() does. The column-to-field matching happens once per query
+(or once at import for fixed column lists) instead of once per row. Request
+bodies are still validated as usual.
+"""
+
+_object_new = object.__new__
+_object_setattr = object.__setattr__
+
+
+def row_builder(model, columns):
+    """Return a function that turns a row tuple into a `model` instance.
+
+    `columns` are field names in SELECT order. Fields without a column get
+    their default; a required field without a column is a programming error.
+    """
+    columns = tuple(columns)
+    fields = model.model_fields
+    unknown = [name for name in columns if name not in fields]
+    if unknown:
+        raise ValueError(f"{model.__name__} has no field(s) {', '.join(unknown)}")
+
+    missing = [name for name in fields if name not in columns]
+    required = [name for name in missing if fields[name].is_required()]
+    if required:
+        raise ValueError(f"{model.__name__} needs column(s) {', '.join(required)}")
+
+    # Models with private attributes or post-init hooks need the real thing
+    if model.__private_attributes__ or model.__pydantic_post_init__:
+        return lambda row: model.model_construct(**dict(zip(columns, row)))
+
+    def build(row):
+        values = dict(zip(columns, row))
+        for name in missing:
+            # Called per row so mutable defaults ([] / {}) are never shared
+            values[name] = fields[name].get_default(call_default_factory=True)
+        obj = _object_new(model)
+        _object_setattr(obj, "__dict__", values)
+        _object_setattr(obj, "__pydantic_fields_set__", set(columns))
+        _object_setattr(obj, "__pydantic_extra__", None)
+        _object_setattr(obj, "__pydantic_private__", None)
+        return obj
+
+    return build
+
+
+def build_models(model, description, rows):
+    """Models for fetched rows, matching columns to fields by name.
+
+    `description` is the cursor's description (psycopg2 or psycopg 3), so the
+    SELECT list must use the model's field names (alias where they differ).
+    """
+    build = row_builder(model, [column.name for column in description])
+    return [build(row) for row in rows]
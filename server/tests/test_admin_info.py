@@ -0,0 +1,38 @@
+import pytest
+
+from models import AdminEventInfo
+from routes.event_routes import MAX_ADMIN_INFO_IDS, admin_infos_in_order, parse_event_ids
+from utils import APIError
+
+
+def test_duplicate_ids_are_dropped_keeping_first_order():
+    assert parse_event_ids("7, 3,7,,12,3") == [7, 3, 12]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [None, "", " , ", "1,two", "1.5", ",".join(str(i) for i in range(1, MAX_ADMIN_INFO_IDS + 2))],
+)
+def test_bad_or_oversized_id_lists_are_rejected(value):
+    with pytest.raises(APIError) as err:
+        parse_event_ids(value)
+    assert err.value.status == 422
+
+
+def test_limit_counts_distinct_ids():
+    ids = ",".join(str(i) for i in range(1, MAX_ADMIN_INFO_IDS + 1))
+    assert len(parse_event_ids(f"{ids},{ids}")) == MAX_ADMIN_INFO_IDS
+
+
+def test_infos_follow_the_requested_order():
+    infos = {
+        3: AdminEventInfo(title="Three", driver_count=0),
+        7: AdminEventInfo(title="Seven", driver_count=2, passenger_count=5),
+    }
+
+    result = admin_infos_in_order([7, 99, 3], infos)
+
+    assert [info["id"] for info in result] == [7, 3]
+    assert result[0] == {
+        "id": 7, "title": "Seven", "driver_count": 2, "passenger_count": 5, "attendees": []
+    }
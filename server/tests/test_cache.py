@@ -0,0 +1,75 @@
+import pytest
+from flask import Flask, g
+
+import cache
+
+
+def test_lru_evicts_oldest_entry():
+    backend = cache.MemoryBackend(max_entries=2, max_bytes=1024)
+    backend.set("a", b"1", 60)
+    backend.set("b", b"2", 60)
+    backend.get("a")
+    backend.set("c", b"3", 60)
+
+    assert backend.get("a") == b"1"
+    assert backend.get("b") is None
+    assert backend.stats()["evictions"] == 1
+
+
+def test_byte_bound_is_enforced():
+    backend = cache.MemoryBackend(max_entries=100, max_bytes=10)
+    backend.set("a", b"12345", 60)
+    backend.set("b", b"12345", 60)
+
+    assert backend.get("a") is None
+    assert backend.stats()["bytes"] <= 10
+
+
+def test_expired_entry_is_a_miss():
+    backend = cache.MemoryBackend()
+    backend.set("a", b"1", 0)
+    assert backend.get("a") is None
+
+
+def test_bump_only_changes_named_tags():
+    backend = cache.MemoryBackend()
+    backend.bump(["events"])
+    assert backend.get_versions(["events", "links"]) == [1, 0]
+
+
+@pytest.fixture
+def cached_app(monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_ENABLED", True)
+    monkeypatch.setattr(cache, "_backend", cache.MemoryBackend())
+    app = Flask(__name__)
+    reads = []
+
+    @app.route("/things")
+    @cache.cached("things")
+    def list_things():
+        reads.append(g.get("primary_reads"))
+        return {"things": len(reads)}
+
+    @app.route("/things", methods=["POST"])
+    def add_thing():
+        cache.invalidate("things")
+        return {}, 201
+
+    return app.test_client(), reads
+
+
+def test_write_invalidates_cached_view(cached_app):
+    client, reads = cached_app
+
+    first = client.get("/things")
+    assert first.headers["X-Cache"] == "MISS"
+    second = client.get("/things")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+
+    assert client.post("/things").status_code == 201
+    third = client.get("/things")
+    assert third.headers["X-Cache"] == "MISS"
+    assert third.get_json() == {"things": 2}
+    # Misses are filled from the primary, never a possibly lagging replica
+    assert reads == [True, True]
@@ -0,0 +1,51 @@
+from carpool import match_carpools
+
+
+def driver(name, seats, hint=None):
+    return {"name": name, "seats_available": seats, "location_hint": hint}
+
+
+def passenger(name, hint=None):
+    return {"name": name, "location_hint": hint}
+
+
+def names(people):
+    return [person["name"] for person in people]
+
+
+def test_respects_seat_counts():
+    plan = match_carpools([driver("d1", 2), driver("d2", 1)], [passenger(f"p{i}") for i in range(5)])
+
+    assert [len(ride["passengers"]) for ride in plan["rides"]] == [2, 1]
+    assert names(plan["unassigned"]) == ["p3", "p4"]
+    assert plan["seats_left"] == 0
+
+
+def test_groups_by_location_hint_first():
+    plan = match_carpools(
+        [driver("north", 2, "Northgate"), driver("south", 2, "Tacoma")],
+        [passenger("a", "tacoma"), passenger("b", " northgate "), passenger("c", "Tacoma")],
+    )
+
+    north, south = plan["rides"]
+    assert names(north["passengers"]) == ["b"]
+    assert names(south["passengers"]) == ["a", "c"]
+
+
+def test_overflow_fills_other_cars_in_sign_up_order():
+    plan = match_carpools(
+        [driver("north", 1, "Northgate"), driver("any", 3)],
+        [passenger("a", "Northgate"), passenger("b"), passenger("c", "Northgate")],
+    )
+
+    north, anywhere = plan["rides"]
+    assert names(north["passengers"]) == ["a"]
+    assert names(anywhere["passengers"]) == ["b", "c"]
+    assert plan["seats_left"] == 1
+
+
+def test_drivers_without_seats_still_listed():
+    plan = match_carpools([driver("solo", None)], [passenger("p")])
+
+    assert plan["rides"][0]["passengers"] == []
+    assert names(plan["unassigned"]) == ["p"]
@@ -0,0 +1,177 @@
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+import db
+
+
+class FakeInfo:
+    transaction_status = psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.info = FakeInfo()
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeCursorConnection(FakeConnection):
+    def cursor(self):
+        return FakeCursor()
+
+    def commit(self):
+        pass
+
+
+class FakeCursor:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    monkeypatch.setattr(db.ConnectionPool, "_connect", lambda self: FakeConnection())
+
+    def _make(minconn=0, maxconn=2, timeout=1.0):
+        return db.ConnectionPool(minconn, maxconn, timeout)
+
+    return _make
+
+
+def test_pool_reuses_connections(make_pool):
+    pool = make_pool(minconn=1, maxconn=2)
+    conn = pool.getconn()
+    pool.putconn(conn)
+
+    assert pool.getconn() is conn
+    assert pool.stats()["in_use"] == 1
+
+
+def test_pool_times_out_when_saturated(make_pool):
+    pool = make_pool(maxconn=1, timeout=0.05)
+    pool.getconn()
+
+    with pytest.raises(db.PoolTimeout):
+        pool.getconn()
+
+    stats = pool.stats()
+    assert stats["timeouts"] == 1
+    assert stats["waiters"] == 0
+
+
+def test_pool_waiters_are_served_in_order(make_pool):
+    pool = make_pool(maxconn=1, timeout=2.0)
+    held = pool.getconn()
+    served = []
+
+    def worker(n):
+        conn = pool.getconn()
+        served.append(n)
+        pool.putconn(conn)
+
+    threads = []
+    for n in range(3):
+        t = threading.Thread(target=worker, args=(n,))
+        t.start()
+        threads.append(t)
+        # make sure each thread is queued before the next one arrives
+        while pool.stats()["waiters"] != n + 1:
+            time.sleep(0.001)
+
+    pool.putconn(held)
+    for t in threads:
+        t.join()
+
+    assert served == [0, 1, 2]
+    assert pool.stats()["in_use"] == 0
+    assert pool.stats()["avg_wait_ms"] > 0
+
+
+def test_broken_connection_is_not_reused(make_pool):
+    pool = make_pool(maxconn=1)
+    conn = pool.getconn()
+    conn.close()
+    pool.putconn(conn)
+
+    assert pool.getconn() is not conn
+
+
+def test_request_shares_one_connection(monkeypatch):
+    import utils
+    from main import app
+
+    checkouts, releases = [], []
+    def fake_connect(readonly=False):
+        checkouts.append(readonly)
+        return FakeCursorConnection()
+
+    monkeypatch.setattr(utils, "connect_db", fake_connect)
+    monkeypatch.setattr(utils, "release_db", releases.append)
+
+    with app.test_request_context("/"):
+        with utils.get_db() as (conn_a, _):
+            pass
+        with utils.get_db() as (conn_b, _):
+            pass
+        assert conn_a is conn_b
+        assert releases == []
+
+    assert checkouts == [False]
+    assert releases == [conn_a]
+
+
+def test_readonly_falls_back_to_primary_when_replica_is_down(make_pool, monkeypatch):
+    primary = make_pool()
+    monkeypatch.setattr(db, "REPLICA_DATABASE_URL", "postgresql://replica")
+    monkeypatch.setattr(db, "_pools", {"primary": primary})
+    monkeypatch.setattr(db, "_replica", {"healthy": True, "lag": None, "checked_at": 0.0})
+
+    def replica_down(name="primary"):
+        if name == "replica":
+            raise psycopg2.OperationalError("connection refused")
+        return primary
+
+    monkeypatch.setattr(db, "get_pool", replica_down)
+
+    conn = db.connect_db(readonly=True)
+    assert primary.owns(conn)
+    assert db.pool_stats()["replica"]["healthy"] is False
+
+    db.release_db(conn)
+    assert primary.stats()["in_use"] == 0
+
+
+def test_async_readonly_skips_a_down_replica_until_the_next_check(monkeypatch):
+    import asyncio
+
+    import async_db
+
+    monkeypatch.setattr(db, "REPLICA_DATABASE_URL", "postgresql://replica")
+    monkeypatch.setattr(db, "_replica", {"healthy": True, "lag": None, "checked_at": 0.0})
+    attempts = []
+
+    class DownPool:
+        async def getconn(self, timeout=None):
+            attempts.append(timeout)
+            raise async_db.PoolTimeout("replica unreachable")
+
+    async def get_async_pool(name="primary"):
+        assert name == "replica"
+        return DownPool()
+
+    monkeypatch.setattr(async_db, "get_async_pool", get_async_pool)
+
+    assert asyncio.run(async_db._checkout_replica()) is None
+    assert db.pool_stats()["replica"]["healthy"] is False
+    # Marked down: later reads go straight to the primary without waiting
+    assert asyncio.run(async_db._checkout_replica()) is None
+    assert attempts == [1]
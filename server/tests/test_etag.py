@@ -0,0 +1,46 @@
+from flask import Flask
+
+from utils import not_modified, success_response, version_etag
+
+app = Flask(__name__)
+
+
+@app.route("/body")
+def body_route():
+    return success_response({"hello": "world"})
+
+
+@app.route("/versioned")
+def versioned_route():
+    etag = version_etag("/versioned?", (3, "2026-01-01"))
+    unchanged = not_modified(etag)
+    if unchanged is not None:
+        return unchanged
+    return success_response([1, 2, 3], etag=etag)
+
+
+def test_body_etag_round_trip():
+    client = app.test_client()
+    first = client.get("/body")
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('"')
+
+    second = client.get("/body", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert second.data == b""
+
+
+def test_version_etag_is_weak_and_answers_304():
+    client = app.test_client()
+    first = client.get("/versioned")
+    assert first.headers["ETag"].startswith('W/"')
+
+    second = client.get("/versioned", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+
+
+def test_version_etag_depends_on_url_and_version():
+    base = version_etag("/events?page=1", (3, "t"))
+    assert base == version_etag("/events?page=1", (3, "t"))
+    assert base != version_etag("/events?page=2", (3, "t"))
+    assert base != version_etag("/events?page=1", (4, "t"))
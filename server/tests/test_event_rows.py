@@ -0,0 +1,49 @@
+from datetime import datetime
+
+import queries.event_queries as event_queries
+from queries.event_queries import get_total_events, row_to_listed_event
+
+ROW = (1, "Cafe", None, datetime(2026, 1, 1), datetime(2026, 1, 2), 1, None, 10, "published")
+
+
+def test_plain_row_has_no_attendance():
+    event = row_to_listed_event(ROW)
+    assert "attendance" not in event.model_dump()
+
+
+def test_attendance_counters_and_remaining_capacity():
+    event = row_to_listed_event(ROW + (12, 3, 2, 5), include_attendance=True)
+    assert event.attendance.model_dump() == {
+        "going": 12,
+        "maybe": 3,
+        "drivers": 2,
+        "seats_offered": 5,
+        "remaining": 0,
+    }
+
+
+def test_remaining_is_none_without_capacity():
+    row = ROW[:7] + (None,) + ROW[8:]
+    event = row_to_listed_event(row + (1, 0, 0, 0), include_attendance=True)
+    assert event.attendance.remaining is None
+
+
+class CountCursor:
+    """Stands in for a cursor: each execute yields the next single-value row."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def fetchone(self):
+        return (self.values.pop(0),)
+
+
+def test_estimate_is_reported_when_used(monkeypatch):
+    monkeypatch.setattr(event_queries, "execute_prepared", lambda db, name, params: None)
+    assert get_total_events(CountCursor(40), approximate_total=True) == (40, True)
+
+
+def test_never_analyzed_table_reports_an_exact_count(monkeypatch):
+    monkeypatch.setattr(event_queries, "execute_prepared", lambda db, name, params: None)
+    # reltuples is unknown (NULL), so the exact COUNT(*) answers instead
+    assert get_total_events(CountCursor(None, 37), approximate_total=True) == (37, False)
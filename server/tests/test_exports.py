@@ -0,0 +1,49 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from routes.export_routes import csv_chunks, ndjson_chunks, parse_event_id
+from utils import APIError
+
+COLUMNS = ("id", "name", "at", "notes")
+BATCHES = [
+    [(1, "Ad", datetime(2026, 11, 1, 18, tzinfo=timezone.utc), 'ok, "quoted"')],
+    [(2, "Reg", datetime(2026, 11, 2), None)],
+]
+
+
+def test_csv_is_one_chunk_per_batch_after_the_header():
+    chunks = list(csv_chunks(COLUMNS, iter(BATCHES)))
+
+    assert chunks == [
+        "id,name,at,notes\r\n",
+        '1,Ad,2026-11-01T18:00:00+00:00,"ok, ""quoted"""\r\n',
+        "2,Reg,2026-11-02T00:00:00,\r\n",
+    ]
+
+
+def test_ndjson_rows_are_objects_keyed_by_column():
+    lines = "".join(ndjson_chunks(COLUMNS, iter(BATCHES))).splitlines()
+
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "name": "Ad", "at": "2026-11-01T18:00:00+00:00", "notes": 'ok, "quoted"'},
+        {"id": 2, "name": "Reg", "at": "2026-11-02T00:00:00", "notes": None},
+    ]
+
+
+def test_empty_export_still_has_a_csv_header():
+    assert list(csv_chunks(COLUMNS, iter([]))) == ["id,name,at,notes\r\n"]
+    assert list(ndjson_chunks(COLUMNS, iter([]))) == []
+
+
+@pytest.mark.parametrize("value", ["abc", "0", "-3", "1.5"])
+def test_malformed_event_id_is_rejected(value):
+    with pytest.raises(APIError) as err:
+        parse_event_id(value)
+    assert err.value.status == 422
+
+
+def test_event_id_is_optional():
+    assert parse_event_id(None) is None
+    assert parse_event_id("42") == 42
@@ -0,0 +1,78 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+import json_provider
+from json_provider import FastJSONProvider, RawJSON
+from models import AttendanceSummary, EventWithAttendance, UserMe
+
+EVENT = EventWithAttendance(
+    id=1,
+    title="Café night",
+    start_datetime=datetime(2026, 11, 1, 18, 30),
+    end_datetime=datetime(2026, 11, 1, 21),
+    created_by=1,
+    attendance=AttendanceSummary(going=3, maybe=1, drivers=1, seats_offered=2, remaining=7),
+)
+# Providers only hold a weak reference to their app
+app = Flask(__name__)
+
+USER = UserMe(id=2, first_name="Reg", last_name="Ular", email="r@x.com", username="reg", admin=False)
+
+
+def stdlib_body(payload):
+    # What the app sent before: jsonify of model_dump() copies
+    return DefaultJSONProvider(app).dumps(payload)
+
+
+@pytest.fixture(params=["orjson", "orjson-without-fragment", "stdlib"])
+def provider(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(json_provider, "orjson", None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson not installed")
+    elif request.param == "orjson-without-fragment":
+        # orjson < 3.9
+        monkeypatch.setattr(json_provider, "_Fragment", None)
+    return FastJSONProvider(app)
+
+
+def test_models_encode_like_their_dump(provider):
+    payload = {"events": [EVENT], "users": [USER], "total": 1}
+    dumped = {"events": [EVENT.model_dump()], "users": [USER.model_dump()], "total": 1}
+
+    assert json.loads(provider.dumps(payload)) == json.loads(stdlib_body(dumped))
+
+
+def test_datetimes_keep_http_date_format(provider):
+    values = [
+        datetime(2026, 11, 1, 18, 30),
+        datetime(2026, 11, 1, 18, 30, tzinfo=timezone(timedelta(hours=-8))),
+        date(2026, 2, 3),
+    ]
+    body = json.loads(provider.dumps(values))
+    assert body == ["Sun, 01 Nov 2026 18:30:00 GMT", "Mon, 02 Nov 2026 02:30:00 GMT", "Tue, 03 Feb 2026 00:00:00 GMT"]
+    assert body == json.loads(stdlib_body(values))
+
+
+def test_response_is_compact_with_sorted_keys(provider):
+    with app.app_context():
+        response = provider.response({"b": 1, "a": [USER]})
+    assert response.mimetype == "application/json"
+    assert response.get_data(as_text=True).startswith('{"a":[{"admin":false,')
+
+
+def test_raw_json_is_spliced_into_the_envelope(provider):
+    # Spacing as json_agg() produces it
+    raw = RawJSON('[{"id" : 1, "title" : "Practice"}, {"id" : 2, "title" : null}]')
+    with app.app_context():
+        body = provider.response({"success": True, "data": raw, "error": None}).get_json()
+    assert body["data"] == [{"id": 1, "title": "Practice"}, {"id": 2, "title": None}]
+
+
+def test_unknown_types_still_raise(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({"x": object()})
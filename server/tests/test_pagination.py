@@ -0,0 +1,16 @@
+import pytest
+
+from utils import APIError, parse_quantity
+
+
+@pytest.mark.parametrize("value", ["0", "-5", "abc", "2.5", "101", None])
+def test_quantity_outside_the_page_bounds_is_rejected(value):
+    with pytest.raises(APIError) as err:
+        parse_quantity(value, 100)
+    assert err.value.status == 422
+    assert err.value.code == "VALIDATION_ERROR"
+
+
+def test_quantity_within_bounds():
+    assert parse_quantity("1", 100) == 1
+    assert parse_quantity(100, 100) == 100
@@ -0,0 +1,20 @@
+import passwords
+
+
+def test_hash_round_trip(monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 4)
+    hashed = passwords.hash_password("secret")
+
+    assert hashed.startswith("$2b$04$")
+    assert passwords.check_password("secret", hashed)
+    assert not passwords.check_password("wrong", hashed)
+
+
+def test_needs_rehash_when_cost_changes(monkeypatch):
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 4)
+    hashed = passwords.hash_password("secret")
+    assert not passwords.needs_rehash(hashed)
+
+    monkeypatch.setattr(passwords, "BCRYPT_ROUNDS", 5)
+    assert passwords.needs_rehash(hashed)
+    assert passwords.needs_rehash("not-a-bcrypt-hash")
@@ -0,0 +1,135 @@
+import pytest
+from psycopg2 import errors as pg_errors
+
+from db import connect_db, release_db
+from models import PracticeAttendanceUpdate, RoutineUpdate
+from queries.practice_queries import (
+    add_practice_attendance,
+    update_practice_attendance,
+    update_routines_bulk,
+)
+from routes.practice_routes import attendance_counts, parse_attendees, parse_batch
+from utils import APIError
+
+
+@pytest.fixture
+def cur():
+    """A cursor whose writes are rolled back afterwards. Needs the test database."""
+    conn = connect_db()
+    try:
+        with conn.cursor() as cur:
+            yield cur
+    finally:
+        conn.rollback()
+        release_db(conn)
+
+
+@pytest.mark.parametrize("attendees", [{"id": 1}, [1, "2"], [1, 2.0], [True], [None]])
+def test_attendees_must_be_a_list_of_user_ids(attendees):
+    with pytest.raises(APIError) as err:
+        parse_attendees(attendees)
+    assert err.value.status == 422
+
+
+def test_repeated_and_existing_attendees_are_counted_once():
+    counts = attendance_counts([4, 5, 5, 6], inserted=[4])
+    assert counts == {"count": 4, "inserted": 1, "already_present": 2}
+
+
+def test_unknown_session_is_a_foreign_key_violation(cur):
+    # The route turns this into 404 NOT_FOUND
+    with pytest.raises(pg_errors.ForeignKeyViolation):
+        add_practice_attendance(cur, -1, [1])
+
+
+@pytest.mark.parametrize(
+    "records",
+    [
+        {"id": 1, "attended": True, "late": False},
+        [{"id": 1, "attended": True}],
+        [{"id": "one", "attended": True, "late": False}],
+        ["not a record"],
+        [{"id": 1, "attended": True, "late": False}, {"id": 1, "attended": False, "late": False}],
+    ],
+)
+def test_bad_batches_are_rejected_before_writing(records):
+    with pytest.raises(APIError) as err:
+        parse_batch(PracticeAttendanceUpdate, records, "Updates")
+    assert err.value.status == 422
+
+
+def test_batch_keeps_the_order_sent():
+    batch = parse_batch(RoutineUpdate, [{"id": 9, "name": "b"}, {"id": 3, "name": "a"}], "Routines")
+    assert [r.id for r in batch] == [9, 3]
+
+
+@pytest.fixture
+def two_sessions(cur):
+    """Attendance rows for two users in each of two sessions: ({session: [practices.id]}, users)."""
+    cur.execute(
+        """
+        INSERT INTO users (first_name, last_name, email, username, password)
+        VALUES ('Ann', 'A', 'bulk-a@test.com', 'bulk_a', 'x'),
+               ('Ben', 'B', 'bulk-b@test.com', 'bulk_b', 'x')
+        RETURNING id;
+        """
+    )
+    users = [row[0] for row in cur.fetchall()]
+    cur.execute(
+        """
+        INSERT INTO practice_sessions (title, date)
+        VALUES ('Bulk one', '2026-11-01'), ('Bulk two', '2026-11-08')
+        RETURNING id;
+        """
+    )
+    sessions = [row[0] for row in cur.fetchall()]
+    rows = {}
+    for session in sessions:
+        cur.execute(
+            """
+            INSERT INTO practices (user_id, practice_session_id)
+            SELECT unnest(%s::int[]), %s
+            RETURNING id;
+            """,
+            (users, session),
+        )
+        rows[session] = [row[0] for row in cur.fetchall()]
+    return rows, users
+
+
+def test_attendance_updates_return_rows_in_the_order_sent(cur, two_sessions):
+    rows, _ = two_sessions
+    session, (first, second) = next(iter(rows.items()))
+    updates = [
+        PracticeAttendanceUpdate(id=second, attended=False, late=False, notes="sick"),
+        PracticeAttendanceUpdate(id=first, attended=True, late=True),
+    ]
+
+    updated = update_practice_attendance(cur, session, updates)
+
+    assert [row["id"] for row in updated] == [second, first]
+    assert [row["notes"] for row in updated] == ["sick", None]
+
+
+def test_attendance_updates_only_touch_the_session_in_the_url(cur, two_sessions):
+    rows, _ = two_sessions
+    session, other = list(rows)
+    updates = [PracticeAttendanceUpdate(id=rows[other][0], attended=False, late=True)]
+
+    assert update_practice_attendance(cur, session, updates) == []
+    cur.execute("SELECT attended, late FROM practices WHERE id = %s;", (rows[other][0],))
+    assert cur.fetchone() == (True, False)
+
+
+def test_routine_updates_return_rows_in_the_order_sent(cur):
+    cur.execute("INSERT INTO routines (name) VALUES ('one'), ('two') RETURNING id;")
+    first, second = [row[0] for row in cur.fetchall()]
+
+    updated = update_routines_bulk(
+        cur, [RoutineUpdate(id=second, name="2nd"), RoutineUpdate(id=first, name="1st", notes="n")]
+    )
+
+    assert updated == [
+        {"id": second, "name": "2nd", "notes": None},
+        {"id": first, "name": "1st", "notes": "n"},
+    ]
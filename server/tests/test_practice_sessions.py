@@ -0,0 +1,33 @@
+from datetime import date
+
+import pytest
+
+from prepared import statement_sql
+from queries.practice_queries import practice_sessions_statement
+from routes.practice_routes import parse_practice_range
+from utils import APIError
+
+
+def test_range_and_cursor_seek_on_date_then_id():
+    name, params = practice_sessions_statement(
+        date(2026, 10, 1), date(2026, 10, 31), after=["2026-10-18T19:00:00", 4], limit=21
+    )
+    query = statement_sql(name)
+
+    assert "AND date >= %s AND date < %s::date + 1 AND (date, id) > (%s, %s)" in query
+    assert query.endswith("ORDER BY date, id LIMIT %s")
+    assert params == [date(2026, 10, 1), date(2026, 10, 31), "2026-10-18T19:00:00", 4, 21]
+
+
+def test_missing_from_defaults_to_today():
+    start, end = parse_practice_range(None, None)
+
+    assert start == date.today()
+    assert end is None
+
+
+@pytest.mark.parametrize("start, end", [("yesterday", None), ("2026-10-31", "2026-10-01")])
+def test_bad_range_is_rejected(start, end):
+    with pytest.raises(APIError) as err:
+        parse_practice_range(start, end)
+    assert err.value.status == 422
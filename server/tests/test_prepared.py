@@ -0,0 +1,48 @@
+import prepared
+
+
+class FakeConnection:
+    def __init__(self):
+        self.prepared = set()
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.executed = []
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+
+
+def test_placeholders_are_numbered():
+    sql, count = prepared._to_server_params("SELECT 1 WHERE a = %s AND b LIKE '%%x' AND c = %s")
+    assert sql == "SELECT 1 WHERE a = $1 AND b LIKE '%x' AND c = $2"
+    assert count == 2
+
+
+def test_statement_is_prepared_once_per_connection():
+    name = prepared.prepare("test_select_user", "SELECT id FROM users WHERE id = %s;")
+    conn = FakeConnection()
+
+    first = FakeCursor(conn)
+    prepared.execute_prepared(first, name, (1,))
+    second = FakeCursor(conn)
+    prepared.execute_prepared(second, name, (2,))
+
+    assert first.executed == [
+        ("PREPARE test_select_user AS SELECT id FROM users WHERE id = $1", None),
+        ("EXECUTE test_select_user (%s)", (1,)),
+    ]
+    assert second.executed == [("EXECUTE test_select_user (%s)", (2,))]
+
+    other = FakeCursor(FakeConnection())
+    prepared.execute_prepared(other, name, (3,))
+    assert other.executed[0][0].startswith("PREPARE")
+
+
+def test_plain_connections_run_sql_text():
+    name = prepared.prepare("test_plain_select", "SELECT 1 WHERE 1 = %s")
+    cur = FakeCursor(object())
+    prepared.execute_prepared(cur, name, (1,))
+    assert cur.executed == [("SELECT 1 WHERE 1 = %s", (1,))]
@@ -0,0 +1,40 @@
+from collections import namedtuple
+from datetime import datetime
+
+import pytest
+
+from models import AdminEventInfo, Attendance, Task
+from rows import build_models, row_builder
+
+Column = namedtuple("Column", "name")
+
+
+def test_builds_models_from_description():
+    description = [Column("id"), Column("user_id"), Column("event_id"), Column("status"), Column("notes")]
+    [attendance] = build_models(Attendance, description, [(1, 2, 3, "going", None)])
+
+    assert attendance == Attendance(id=1, user_id=2, event_id=3, status="going")
+    assert attendance.model_fields_set == {"id", "user_id", "event_id", "status", "notes"}
+
+
+def test_matches_validated_model_dump():
+    row = (7, "Set up", None, 2, 1, datetime(2026, 11, 1), 3, False)
+    columns = ("id", "title", "description", "assigned_to", "created_by", "due_date", "event_id", "completed")
+
+    built = row_builder(Task, columns)(row)
+    assert built.model_dump() == Task(**dict(zip(columns, row))).model_dump()
+
+
+def test_mutable_defaults_are_not_shared():
+    build = row_builder(AdminEventInfo, ("title", "driver_count"))
+    first, second = build(("a", 0)), build(("b", 1))
+
+    first.attendees.append({"first_name": "Reg"})
+    assert second.attendees == []
+
+
+def test_rejects_columns_that_do_not_fit_the_model():
+    with pytest.raises(ValueError, match="no field"):
+        row_builder(Attendance, ("id", "user_id", "event_id", "status", "start_date"))
+    with pytest.raises(ValueError, match="needs column"):
+        row_builder(Attendance, ("id", "user_id"))
@@ -0,0 +1,118 @@
+"""Load test for event sign-up under contention.
+
+Fires SIGNUPS simultaneous POST /attendances/me requests at one event with
+room for CAPACITY people, then checks nobody was overbooked and the slowest
+sign-ups still finished in reasonable time. Needs the test database.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from auth import create_token
+from db import connect_db, release_db
+from main import app
+
+SIGNUPS = 200
+CAPACITY = 25
+# Generous so a loaded CI box passes; a regression to table locks or retries blows well past it
+P99_LIMIT = 2.0
+
+
+@pytest.fixture
+def crowded_event():
+    tag = uuid.uuid4().hex[:8]
+    conn = connect_db()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                INSERT INTO users (first_name, last_name, email, username, password)
+                SELECT 'Load', 'Test', %s || n || '@test.com', %s || n, 'x'
+                FROM generate_series(1, %s) AS n
+                RETURNING id;
+                """,
+                (f"signup-{tag}-", f"signup_{tag}_", SIGNUPS),
+            )
+            user_ids = [row[0] for row in cur.fetchall()]
+            cur.execute(
+                """
+                INSERT INTO events (title, start_date, end_date, created_by, max_attendees, status)
+                VALUES ('Sign-up rush', now() + interval '1 day', now() + interval '2 days',
+                        %s, %s, 'published')
+                RETURNING id;
+                """,
+                (user_ids[0], CAPACITY),
+            )
+            event_id = cur.fetchone()[0]
+        conn.commit()
+
+        yield event_id, user_ids
+
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM events WHERE id = %s;", (event_id,))
+            cur.execute("DELETE FROM users WHERE id = ANY(%s);", (user_ids,))
+        conn.commit()
+    finally:
+        release_db(conn)
+
+
+def test_concurrent_signups_never_overbook(crowded_event):
+    event_id, user_ids = crowded_event
+    tokens = [create_token(user_id, False) for user_id in user_ids]
+    start = threading.Barrier(len(tokens))
+    results = [None] * len(tokens)
+
+    def sign_up(i):
+        client = app.test_client()
+        start.wait()
+        began = time.perf_counter()
+        res = client.post(
+            "/attendances/me",
+            json={"event_id": event_id, "status": "going"},
+            headers={"Authorization": f"Bearer {tokens[i]}"},
+        )
+        results[i] = (res.status_code, time.perf_counter() - began)
+
+    threads = [threading.Thread(target=sign_up, args=(i,)) for i in range(len(tokens))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    statuses = [status for status, _ in results]
+    assert statuses.count(201) == CAPACITY
+    assert statuses.count(409) == SIGNUPS - CAPACITY
+
+    conn = connect_db()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT count(*) FROM attendances WHERE event_id = %s AND status = 'going';",
+                (event_id,),
+            )
+            going = cur.fetchone()[0]
+            cur.execute("SELECT going_count FROM events WHERE id = %s;", (event_id,))
+            going_count = cur.fetchone()[0]
+        conn.rollback()
+    finally:
+        release_db(conn)
+    assert going == going_count == CAPACITY
+
+    latencies = sorted(elapsed for _, elapsed in results)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    assert p99 < P99_LIMIT, f"p99 sign-up latency {p99:.3f}s"
+
+
+def test_second_signup_is_rejected(crowded_event):
+    event_id, user_ids = crowded_event
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {create_token(user_ids[0], False)}"}
+    body = {"event_id": event_id, "status": "going"}
+
+    assert client.post("/attendances/me", json=body, headers=headers).status_code == 201
+    res = client.post("/attendances/me", json=body, headers=headers)
+    assert res.status_code == 409
+    assert res.get_json()["error"]["code"] == "ALREADY_SIGNED_UP"
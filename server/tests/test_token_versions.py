@@ -0,0 +1,39 @@
+from flask import Flask
+
+import auth
+
+
+def test_token_carries_role_and_version(monkeypatch):
+    monkeypatch.setattr(auth, "SECRET_KEY", "test-secret-long-enough-for-hs256-keys")
+    claims = auth.decode_token(auth.create_token(7, False, True, 3))
+    assert claims["user_id"] == 7
+    assert claims["admin"] is True
+    assert claims["ver"] == 3
+
+
+def test_cached_version_expires(monkeypatch):
+    monkeypatch.setattr(auth, "TOKEN_VERSION_TTL", 0)
+    auth.remember_token_version(7, 1)
+    assert auth.cached_token_version(7) is None
+
+
+def test_forget_drops_cached_version():
+    auth.remember_token_version(8, 2)
+    assert auth.cached_token_version(8) == 2
+    auth.forget_token_version(8)
+    assert auth.cached_token_version(8) is None
+
+
+def test_forget_waits_for_the_request_to_succeed():
+    app = Flask(__name__)
+
+    @app.route("/demote", methods=["POST"])
+    def demote():
+        auth.forget_token_version(9)
+        # Not committed yet: the old version must still be the cached one
+        assert auth.cached_token_version(9) == 1
+        return {}
+
+    auth.remember_token_version(9, 1)
+    app.test_client().post("/demote")
+    assert auth.cached_token_version(9) is None
@@ -0,0 +1,32 @@
+from prepared import statement_sql
+from queries.user_queries import users_directory_statement
+
+
+def test_projection_keeps_id_and_sort_columns():
+    name, params, columns = users_directory_statement(("username",), sort="name", limit=11)
+    query = statement_sql(name)
+
+    assert columns == ["id", "first_name", "last_name", "username"]
+    assert query.startswith("SELECT id, first_name, last_name, username FROM users")
+    assert query.endswith("ORDER BY last_name, first_name, id LIMIT %s")
+    assert params == [11]
+
+
+def test_field_order_does_not_add_statements():
+    first, _, _ = users_directory_statement(("email", "username"), limit=11)
+    second, _, _ = users_directory_statement(("username", "email"), limit=11)
+    other, _, _ = users_directory_statement(("username",), limit=11)
+
+    assert first == second
+    assert other != first
+
+
+def test_filters_and_cursor_seek_on_the_sort_key():
+    name, params, _ = users_directory_statement(
+        ("first_name",), sort="name", after=["Oros", "Bruno", 7], user_type="maid", admin=False
+    )
+    query = statement_sql(name)
+
+    assert "AND type = %s AND admin = %s AND (last_name, first_name, id) > (%s, %s, %s)" in query
+    assert params == ["maid", False, "Oros", "Bruno", 7]
+    assert "LIMIT" not in query
@@ -1,15 +1,54 @@
-from flask import jsonify
+from flask import g, has_app_context, has_request_context, jsonify, make_response, request
 
+import base64
+import hashlib
+import json
 from contextlib import contextmanager
 
 
-from db import connect_db, release_db 
+from db import PoolTimeout, connect_db, pool_stats, release_db
+
+def _checkout(readonly=False):
+    try:
+        return connect_db(readonly=readonly)
+    except PoolTimeout:
+        raise APIError("DB_BUSY", "Server is busy, please try again", 503)
+
+
+def _request_conn(readonly):
+    # One pooled connection per request, shared by the auth decorators and the
+    # route handler. It is returned to the pool in release_request_db().
+    # Read-only work reuses the primary connection if the request already has
+    # one, otherwise it gets its own (possibly replica) connection, unless the
+    # response is about to be cached (cache.cached sets g.primary_reads).
+    if "db_conn" in g:
+        return g.db_conn
+    if readonly and not g.get("primary_reads"):
+        if "db_read_conn" not in g:
+            g.db_read_conn = _checkout(readonly=True)
+        return g.db_read_conn
+    g.db_conn = _checkout()
+    return g.db_conn
+
 
 @contextmanager
-def get_db():
+def get_db(readonly=False):
+    if has_app_context():
+        conn = _request_conn(readonly)
+        cur = conn.cursor()
+        try:
+            yield conn, cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+        return
+
     conn = None
     try:
-        conn = connect_db()
+        conn = _checkout(readonly)
         cur = conn.cursor()
         yield conn, cur
         conn.commit()
@@ -21,11 +60,34 @@ def get_db():
         if conn:
             release_db(conn)
 
+
+def release_request_db(exc=None):
+    for key in ("db_conn", "db_read_conn"):
+        conn = g.pop(key, None)
+        if conn is not None:
+            release_db(conn)
+
+
+def db_stats():
+    return pool_stats()
+
 # ── Response helpers ──────────────────────────────────────────────────────────
 
 
-def success_response(data, status=200):
-    return jsonify({"success": True, "data": data, "error": None}), status
+def success_response(data, status=200, etag=None):
+    """JSON envelope. Successful GETs carry an ETag and become a 304 when the
+    client's If-None-Match matches; pass etag= (from version_etag()) to use a
+    cheap version validator instead of hashing the body."""
+    response = jsonify({"success": True, "data": data, "error": None})
+    response.status_code = status
+    if status == 200 and has_request_context() and request.method in ("GET", "HEAD"):
+        if etag is None:
+            response.set_etag(body_etag(response.get_data()))
+        else:
+            response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "no-cache"
+        response.make_conditional(request)
+    return response
 
 
 def error_response(code, message, status=400):
@@ -34,6 +96,69 @@ def error_response(code, message, status=400):
     ), status
 
 
+# ── Conditional requests ──────────────────────────────────────────────────────
+
+# Bump when the payload of a version-validated route changes shape, so clients
+# holding an old ETag refetch after a deploy
+ETAG_FORMAT = 1
+
+
+def body_etag(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def version_etag(url, version):
+    """Weak ETag for a URL (path + query) from a cheap version of the rows behind
+    it, e.g. (row count, max updated_at), so a 304 needs no rows fetched."""
+    raw = json.dumps([ETAG_FORMAT, url, version], default=str)
+    return "v" + hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def request_url():
+    return f"{request.path}?{request.query_string.decode()}"
+
+
+def not_modified(etag):
+    """A 304 for a weak version ETag the client already has, else None."""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = make_response("", 304)
+    response.set_etag(etag, weak=True)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+# ── Cursor pagination ─────────────────────────────────────────────────────────
+
+
+def encode_cursor(kind, key):
+    """Opaque cursor for keyset pagination: the sort name plus the last row's key."""
+    raw = json.dumps({"k": kind, "v": key}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def parse_quantity(value, maximum):
+    """?quantity= for one keyset page: an integer from 1 to `maximum`, else 422."""
+    try:
+        quantity = int(value)
+    except (TypeError, ValueError):
+        quantity = 0
+    if not 1 <= quantity <= maximum:
+        raise APIError("VALIDATION_ERROR", f"quantity must be between 1 and {maximum}", 422)
+    return quantity
+
+
+def decode_cursor(cursor, kind):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["k"] == kind and isinstance(payload["v"], list):
+            return payload["v"]
+    except (ValueError, KeyError, TypeError):
+        pass
+    raise APIError("INVALID_CURSOR", "Invalid or expired cursor", 400)
+
+
 # ── Custom exception ──────────────────────────────────────────────────────────
 
 